@@ -5,6 +5,7 @@ from .state import (
     Assumption,
     AssumptionSource,
     CalculationResult,
+    CalculationResultDict,
     ClarificationOption,
     ClarificationQuestion,
     ConfidenceLevel,
@@ -15,7 +16,6 @@ from .state import (
     MissingInfoType,
     QueryType,
     RetrievedRule,
-    add_reasoning_step,
     create_initial_state,
     get_assumptions,
     get_calculation_results,
@@ -24,6 +24,7 @@ from .state import (
     get_retrieved_rules,
     has_critical_missing_info,
     is_compliance_query,
+    new_reasoning_step,
 )
 from .nodes import (
     classifier_node,
@@ -48,6 +49,7 @@ from .nodes import (
 from .graph import (
     create_agent_graph,
     get_agent_graph,
+    get_durability,
     reset_agent_graph,
 )
 from .orchestrator import (
@@ -63,6 +65,7 @@ __all__ = [
     "Assumption",
     "AssumptionSource",
     "CalculationResult",
+    "CalculationResultDict",
     "ClarificationOption",
     "ClarificationQuestion",
     "ConfidenceLevel",
@@ -73,7 +76,6 @@ __all__ = [
     "MissingInfoType",
     "QueryType",
     "RetrievedRule",
-    "add_reasoning_step",
     "create_initial_state",
     "get_assumptions",
     "get_calculation_results",
@@ -82,6 +84,7 @@ __all__ = [
     "get_retrieved_rules",
     "has_critical_missing_info",
     "is_compliance_query",
+    "new_reasoning_step",
     "classifier_node",
     "context_loader_node",
     "retriever_node",
@@ -102,6 +105,7 @@ __all__ = [
     "extract_raw_answer",
     "create_agent_graph",
     "get_agent_graph",
+    "get_durability",
     "reset_agent_graph",
     "AgentOrchestrator",
     "AgentResponse",
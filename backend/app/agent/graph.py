@@ -3,66 +3,168 @@
 from __future__ import annotations
 
 import logging
-from functools import partial
-from typing import Any, Literal
+import threading
+from typing import Literal
 
 from langgraph.graph import StateGraph, END
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_stream_writer
+from langgraph.types import Durability
 from langchain_core.runnables import RunnableConfig
 
+from app.agent.nodes import (
+    assumption_analyzer_node,
+    calculator_node,
+    clarification_router_node,
+    clarifier_node,
+    classifier_node,
+    context_loader_node,
+    reasoner_node,
+    response_formatter_node,
+    retriever_node,
+    validator_node,
+)
 from app.agent.state import AgentState, QueryType
 
 logger = logging.getLogger(__name__)
 
+CheckpointMode = Literal["per_node", "end_of_workflow"]
+QueryRoute = Literal[
+    "general",
+    "legal_search",
+    "compliance_check",
+    "calculation",
+    "clarification_response",
+]
+MissingInfoRoute = Literal[
+    "needs_clarification",
+    "proceed_to_calculator",
+    "skip_calculator",
+]
+
 
 def _extract_openai_client(config: RunnableConfig | None):
     """Extract OpenAI client from LangGraph config."""
     if config is None:
         return None
-    configurable = config.get("configurable", {})
-    return configurable.get("openai_client")
+    configurable = config.get("configurable")
+    return configurable.get("openai_client") if configurable else None
+
+
+def _with_openai_client(node_fn):
+    """Adapt a node taking an OpenAI client to read the client from config."""
+
+    async def node_with_config(state: AgentState, config: RunnableConfig) -> dict:
+        return await node_fn(state, _extract_openai_client(config))
+
+    node_with_config.__name__ = f"{node_fn.__name__}_with_config"
+    return node_with_config
+
 
+async def _clarifier_with_config(state: AgentState, config: RunnableConfig) -> dict:
+    """Run the clarifier, streaming its message when the caller opted in.
+
+    Callers that set ``stream_tokens`` in the configurable dict and stream
+    with ``stream_mode="custom"`` receive ``{"node", "chunk"}`` events for
+    each generated text delta.
+    """
+    configurable = config.get("configurable") or {}
+
+    on_token = None
+    if configurable.get("stream_tokens"):
+        writer = get_stream_writer()
+
+        def on_token(chunk: str) -> None:
+            writer({"node": "clarifier", "chunk": chunk})
+
+    return await clarifier_node(
+        state, configurable.get("openai_client"), on_token=on_token
+    )
 
-def route_by_query_type(state: AgentState) -> str:
+
+_QUERY_ROUTES: dict[str, QueryRoute] = {
+    QueryType.GENERAL.value: "general",
+    QueryType.LEGAL_SEARCH.value: "legal_search",
+    QueryType.COMPLIANCE_CHECK.value: "compliance_check",
+    QueryType.CALCULATION.value: "calculation",
+    QueryType.CLARIFICATION_RESPONSE.value: "clarification_response",
+}
+
+
+def route_by_query_type(state: AgentState) -> QueryRoute:
     """Route based on classified query type.
 
     Returns:
-        Route key: "general", "legal_search", "compliance_check", or "calculation"
+        Route key: "general", "legal_search", "compliance_check", "calculation",
+        or "clarification_response"; unknown types fall back to "general"
     """
-    query_type = state.get("query_type", QueryType.GENERAL.value)
-
-    if query_type == QueryType.GENERAL.value:
-        return "general"
-    elif query_type == QueryType.LEGAL_SEARCH.value:
-        return "legal_search"
-    elif query_type == QueryType.COMPLIANCE_CHECK.value:
-        return "compliance_check"
-    elif query_type == QueryType.CALCULATION.value:
-        return "calculation"
-    elif query_type == QueryType.CLARIFICATION_RESPONSE.value:
-        return "clarification_response"
-    else:
-        return "general"
-
-
-def route_by_missing_info(state: AgentState) -> str:
+    return _QUERY_ROUTES.get(state.get("query_type", QueryType.GENERAL.value), "general")
+
+
+def fan_out_by_query_type(state: AgentState) -> list[str]:
+    """Fan out from the classifier based on query type.
+
+    General queries go straight to the reasoner. Every other query type loads
+    the drawing context and retrieves rules; neither depends on the other, so
+    both run concurrently in the same super-step.
+
+    Returns:
+        Node names to run next
+    """
+    if route_by_query_type(state) == "general":
+        return ["reasoner"]
+    return ["context_loader", "retriever"]
+
+
+# Indexed by (awaiting_clarification << 1) | bool(pending_calculations)
+_MISSING_INFO_ROUTES: tuple[MissingInfoRoute, ...] = (
+    "skip_calculator",
+    "proceed_to_calculator",
+    "needs_clarification",
+    "needs_clarification",
+)
+
+
+def route_by_missing_info(state: AgentState) -> MissingInfoRoute:
     """Route based on whether clarification is needed.
 
     Returns:
         Route key: "needs_clarification", "proceed_to_calculator", or "skip_calculator"
     """
-    awaiting = state.get("awaiting_clarification", False)
-    pending = state.get("pending_calculations", [])
+    return _MISSING_INFO_ROUTES[
+        (bool(state.get("awaiting_clarification")) << 1)
+        | bool(state.get("pending_calculations"))
+    ]
+
+
+# Durability to run with for each checkpointing mode. "exit" persists once
+# when a run finishes instead of after every super-step.
+_CHECKPOINT_DURABILITY: dict[CheckpointMode, Durability] = {
+    "per_node": "async",
+    "end_of_workflow": "exit",
+}
+
+
+def get_durability(use_checkpointer: bool | CheckpointMode) -> Durability | None:
+    """Durability to pass to invoke/ainvoke/astream for a checkpointing mode.
 
-    if awaiting:
-        return "needs_clarification"
-    elif pending:
-        return "proceed_to_calculator"
-    else:
-        return "skip_calculator"
+    Args:
+        use_checkpointer: Memory checkpointing mode (see create_agent_graph)
+
+    Returns:
+        LangGraph durability mode, or None when there is no checkpointer
+    """
+    if not use_checkpointer:
+        return None
+    if use_checkpointer is True:
+        use_checkpointer = "per_node"
+    return _CHECKPOINT_DURABILITY[use_checkpointer]
 
 
-def create_agent_graph(use_checkpointer: bool = False) -> StateGraph:
+def create_agent_graph(
+    use_checkpointer: bool | CheckpointMode = False,
+) -> CompiledStateGraph:
     """
     Create the LangGraph workflow for the AI agent.
 
@@ -74,14 +176,15 @@ def create_agent_graph(use_checkpointer: bool = False) -> StateGraph:
             |        |        |
             v        v        v
          general  legal_*  compliance_*
+            |        |        |
+            |        +---+----+
             |        |        |
             |        v        v
-            |   context_loader
-            |        |
-            |        v
-            |    retriever
-            |        |
-            |        v
+            |  context_loader  retriever    (run concurrently)
+            |        |        |
+            |        +---+----+
+            |            |
+            |            v
             |  assumption_analyzer
             |        |
             |        v
@@ -105,65 +208,39 @@ def create_agent_graph(use_checkpointer: bool = False) -> StateGraph:
     ```
 
     Args:
-        use_checkpointer: Whether to use memory checkpointing for persistence
+        use_checkpointer: Memory checkpointing mode. False disables it; True or
+            "per_node" saves a checkpoint after every node; "end_of_workflow"
+            saves only the final state of each run. Both modes compile the
+            same graph; callers pass durability=get_durability(mode) when
+            running it
 
     Returns:
         Compiled StateGraph ready for execution
     """
-    from app.agent.nodes.classifier import classifier_node
-    from app.agent.nodes.context_loader import context_loader_node
-    from app.agent.nodes.retriever import retriever_node
-    from app.agent.nodes.assumption_analyzer import assumption_analyzer_node
-    from app.agent.nodes.clarification_router import clarification_router_node
-    from app.agent.nodes.clarifier import clarifier_node
-    from app.agent.nodes.calculator import calculator_node
-    from app.agent.nodes.validator import validator_node
-    from app.agent.nodes.reasoner import reasoner_node
-    from app.agent.nodes.response_formatter import response_formatter_node
-
-    # Create wrapper functions that extract openai_client from config
-    async def classifier_with_config(state: AgentState, config: RunnableConfig) -> dict:
-        openai_client = _extract_openai_client(config)
-        return await classifier_node(state, openai_client)
-
-    async def clarifier_with_config(state: AgentState, config: RunnableConfig) -> dict:
-        openai_client = _extract_openai_client(config)
-        return await clarifier_node(state, openai_client)
-
-    async def reasoner_with_config(state: AgentState, config: RunnableConfig) -> dict:
-        openai_client = _extract_openai_client(config)
-        return await reasoner_node(state, openai_client)
-
     graph = StateGraph(AgentState)
 
     # Nodes that need OpenAI client use wrapped versions
-    graph.add_node("classifier", classifier_with_config)
+    graph.add_node("classifier", _with_openai_client(classifier_node))
     graph.add_node("context_loader", context_loader_node)
     graph.add_node("retriever", retriever_node)
     graph.add_node("assumption_analyzer", assumption_analyzer_node)
     graph.add_node("clarification_router", clarification_router_node)
-    graph.add_node("clarifier", clarifier_with_config)
+    graph.add_node("clarifier", _clarifier_with_config)
     graph.add_node("calculator", calculator_node)
     graph.add_node("validator", validator_node)
-    graph.add_node("reasoner", reasoner_with_config)
+    graph.add_node("reasoner", _with_openai_client(reasoner_node))
     graph.add_node("response_formatter", response_formatter_node)
 
     graph.set_entry_point("classifier")
 
     graph.add_conditional_edges(
         "classifier",
-        route_by_query_type,
-        {
-            "general": "reasoner",
-            "legal_search": "context_loader",
-            "compliance_check": "context_loader",
-            "calculation": "context_loader",
-            "clarification_response": "context_loader",
-        }
+        fan_out_by_query_type,
+        ["reasoner", "context_loader", "retriever"],
     )
 
-    graph.add_edge("context_loader", "retriever")
-    graph.add_edge("retriever", "assumption_analyzer")
+    # Join: assumption_analyzer waits for both branches to finish
+    graph.add_edge(["context_loader", "retriever"], "assumption_analyzer")
     graph.add_edge("assumption_analyzer", "clarification_router")
 
     graph.add_conditional_edges(
@@ -192,28 +269,44 @@ def create_agent_graph(use_checkpointer: bool = False) -> StateGraph:
     return graph.compile(checkpointer=checkpointer)
 
 
-_compiled_graph = None
+_compiled_graphs: dict[bool | CheckpointMode, CompiledStateGraph] = {}
+_compile_lock = threading.Lock()
 
 
-def get_agent_graph(use_checkpointer: bool = False) -> StateGraph:
-    """Get or create the singleton agent graph.
+def get_agent_graph(
+    use_checkpointer: bool | CheckpointMode = False,
+) -> CompiledStateGraph:
+    """Get or create the singleton agent graph for a checkpointing mode.
+
+    A compiled graph is cached per ``use_checkpointer`` value, so asking for
+    a different mode never returns a graph compiled for the other one.
 
     Args:
-        use_checkpointer: Whether to enable memory checkpointing
+        use_checkpointer: Memory checkpointing mode (see create_agent_graph)
 
     Returns:
         Compiled agent graph
     """
-    global _compiled_graph
+    if use_checkpointer is True:
+        use_checkpointer = "per_node"
+
+    graph = _compiled_graphs.get(use_checkpointer)
+    if graph is not None:
+        return graph
 
-    if _compiled_graph is None:
-        _compiled_graph = create_agent_graph(use_checkpointer=use_checkpointer)
-        logger.info("Agent graph compiled successfully")
+    with _compile_lock:
+        graph = _compiled_graphs.get(use_checkpointer)
+        if graph is None:
+            graph = create_agent_graph(use_checkpointer=use_checkpointer)
+            _compiled_graphs[use_checkpointer] = graph
+            logger.info(
+                f"Agent graph compiled successfully (checkpointer={use_checkpointer})"
+            )
 
-    return _compiled_graph
+    return graph
 
 
 def reset_agent_graph() -> None:
-    """Reset the singleton graph. Useful for testing."""
-    global _compiled_graph
-    _compiled_graph = None
+    """Reset the cached graphs. Useful for testing."""
+    with _compile_lock:
+        _compiled_graphs.clear()
@@ -0,0 +1,20 @@
+"""Keyword matching shared by the agent nodes."""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+def keyword_lookahead_re(keywords: Iterable[str]) -> re.Pattern[str]:
+    """Compile keywords so one finditer reports every match, even overlapping.
+
+    Each match is zero-width with the keyword in group 1. Longer keywords
+    are tried first, so the longest keyword starting at a position is the
+    one reported there.
+    """
+    return re.compile(
+        "(?=("
+        + "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        + "))"
+    )
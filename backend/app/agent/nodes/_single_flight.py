@@ -0,0 +1,63 @@
+"""Collapse concurrent identical LLM requests into a single call."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-progress call between concurrent callers with the same key.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight await its outcome instead of issuing their own request. Nothing is
+    kept once the call finishes, so later callers start a fresh call.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run call for key, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the request; equal keys must mean equal requests
+            call: Zero-argument coroutine factory performing the request
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another caller's in-flight call
+
+        Raises:
+            Whatever the call raised, for the caller that ran it and for every
+            caller that joined it
+        """
+        loop = asyncio.get_running_loop()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            # Shield so a cancelled joiner does not cancel the shared call
+            return await asyncio.shield(inflight), True
+
+        future: asyncio.Future[Any] = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError("In-flight request was cancelled"))
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            # Mark any exception retrieved so asyncio does not warn when no
+            # caller joined
+            if future.done() and not future.cancelled():
+                future.exception()
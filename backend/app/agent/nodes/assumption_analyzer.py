@@ -3,18 +3,17 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable
 
+from app.agent.nodes._keywords import keyword_lookahead_re
 from app.agent.state import (
     AgentState,
-    Assumption,
     AssumptionSource,
     ClarificationOption,
-    ClarificationQuestion,
     ConfidenceLevel,
     MissingInfoType,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,6 +34,15 @@ class DefinitionSpec:
     default_confidence: ConfidenceLevel
     affects: list[str]
     caveat_if_assumed: str
+    options_dump: tuple[dict[str, Any], ...] | None = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Options are static, so serialize them once instead of per question
+        self.options_dump = (
+            tuple(opt.model_dump() for opt in self.options)
+            if self.options
+            else None
+        )
 
 
 TEMPORAL_DEFINITIONS: dict[str, DefinitionSpec] = {
@@ -259,9 +267,39 @@ CONTEXTUAL_DEFINITIONS: dict[str, DefinitionSpec] = {
 }
 
 
-def _text_contains_definition(text: str, spec: DefinitionSpec) -> bool:
-    """Check if text contains any of the definition's keywords."""
-    text_lower = text.lower()
+_ALL_SPEC_FIELDS: frozenset[str] = frozenset(
+    spec.field_name
+    for definitions in (TEMPORAL_DEFINITIONS, CONTEXTUAL_DEFINITIONS)
+    for spec in definitions.values()
+)
+
+# Definition names in a rule's uses_definitions that flag a temporal dependency
+_DEF_NAME_VARIANTS: frozenset[str] = frozenset({
+    "original dwellinghouse",
+    "original house",
+    "curtilage",
+})
+
+_KEYWORD_TO_DEFINITION: dict[str, str] = {
+    keyword: def_key
+    for definitions in (TEMPORAL_DEFINITIONS, CONTEXTUAL_DEFINITIONS)
+    for def_key, spec in definitions.items()
+    for keyword in spec.keywords
+}
+
+_DEFINITION_KEYWORD_RE = keyword_lookahead_re(_KEYWORD_TO_DEFINITION)
+
+
+def _find_definitions(text_lower: str) -> set[str]:
+    """Find the keys of all definitions whose keywords appear in the text."""
+    return {
+        _KEYWORD_TO_DEFINITION[match.group(1)]
+        for match in _DEFINITION_KEYWORD_RE.finditer(text_lower)
+    }
+
+
+def _text_contains_definition(text_lower: str, spec: DefinitionSpec) -> bool:
+    """Check if already-lowercased text contains any of the definition's keywords."""
     return any(kw in text_lower for kw in spec.keywords)
 
 
@@ -274,11 +312,36 @@ def _get_context_value(drawing_context: dict | None, field_name: str) -> Any:
 
 def _is_value_set(value: Any) -> bool:
     """Check if a context value has been meaningfully set."""
-    if value is None:
-        return False
-    if isinstance(value, str) and value.strip() == "":
-        return False
-    return True
+    return value is not None and (
+        not isinstance(value, str) or (bool(value) and not value.isspace())
+    )
+
+
+def _make_assumption(
+    id: str,
+    description: str,
+    field_name: str,
+    assumed_value: Any,
+    confidence: ConfidenceLevel,
+    source: AssumptionSource,
+    affects_rules: list[str],
+    can_invalidate_answer: bool,
+) -> dict[str, Any]:
+    """Build an assumption record matching Assumption.model_dump().
+
+    The inputs are trusted constants and context values, so the Pydantic
+    model is skipped here and kept for validation at the API boundary.
+    """
+    return {
+        "id": id,
+        "description": description,
+        "field_name": field_name,
+        "assumed_value": assumed_value,
+        "confidence": confidence.value,
+        "source": source.value,
+        "affects_rules": list(affects_rules),
+        "can_invalidate_answer": can_invalidate_answer,
+    }
 
 
 def _collect_affected_sections(rules: list[dict]) -> list[str]:
@@ -291,22 +354,6 @@ def _collect_affected_sections(rules: list[dict]) -> list[str]:
     return sections
 
 
-def _question_already_exists(
-    questions: list[dict],
-    question_id: str,
-) -> bool:
-    """Check if a clarification question already exists."""
-    return any(q.get("id") == question_id for q in questions)
-
-
-def _assumption_already_exists(
-    assumptions: list[dict],
-    field_name: str,
-) -> bool:
-    """Check if an assumption for this field already exists."""
-    return any(a.get("field_name") == field_name for a in assumptions)
-
-
 async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
     """
     Analyze retrieved rules for assumptions and missing information.
@@ -326,16 +373,21 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
         state: Current agent state with retrieved_rules and drawing_context
 
     Returns:
-        State updates with assumptions, missing_info, clarification_questions, caveats
+        State updates with new assumptions, missing_info, clarification_questions
+        and caveats; the channel reducers merge them into the existing state
     """
     retrieved_rules = state.get("retrieved_rules", [])
     drawing_context = state.get("drawing_context")
     query_type = state.get("query_type", "")
 
-    existing_assumptions = list(state.get("assumptions", []))
-    existing_missing = list(state.get("missing_info", []))
-    existing_questions = list(state.get("clarification_questions", []))
-    existing_caveats = list(state.get("caveats", []))
+    existing_missing = set(state.get("missing_info", []))
+    existing_caveats = set(state.get("caveats", []))
+    existing_question_ids = {
+        q.get("id") for q in state.get("clarification_questions", [])
+    }
+    existing_assumption_fields = {
+        a.get("field_name") for a in state.get("assumptions", [])
+    }
 
     new_assumptions: list[dict] = []
     new_missing: list[str] = []
@@ -344,36 +396,41 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
 
     if not retrieved_rules:
         return {
-            "reasoning_chain": add_reasoning_step(
-                state,
+            "reasoning_chain": new_reasoning_step(
                 "No rules to analyze for assumptions",
             ),
         }
 
+    # Every field is provided and already recorded, so no rule can yield
+    # a new question, assumption or caveat
+    if (
+        drawing_context
+        and _ALL_SPEC_FIELDS <= existing_assumption_fields
+        and all(_is_value_set(drawing_context.get(f)) for f in _ALL_SPEC_FIELDS)
+    ):
+        return {
+            "reasoning_chain": new_reasoning_step(
+                "All contextual fields already provided, skipping analysis",
+            ),
+        }
+
     is_compliance_check = query_type in {"compliance_check", "calculation"}
 
     detected_definitions: dict[str, tuple[DefinitionSpec, list[str]]] = {}
 
     for rule in retrieved_rules:
-        uses_definitions = rule.get("uses_definitions", [])
-        rule_text = rule.get("text", "")
+        uses_def_lower = {d.lower() for d in rule.get("uses_definitions", [])}
         rule_section = rule.get("section") or "unknown"  # Handle None explicitly
+        rule_text_lower = rule.get("text", "").lower()
+        matched_definitions = _find_definitions(rule_text_lower)
 
         for def_key, spec in TEMPORAL_DEFINITIONS.items():
             if def_key in detected_definitions:
                 detected_definitions[def_key][1].append(rule_section)
                 continue
 
-            def_name_variants = [
-                "original dwellinghouse",
-                "original house",
-                "curtilage",
-            ]
-            found_in_uses = any(
-                d.lower() in def_name_variants
-                for d in uses_definitions
-            )
-            found_in_text = _text_contains_definition(rule_text, spec)
+            found_in_uses = bool(uses_def_lower & _DEF_NAME_VARIANTS)
+            found_in_text = def_key in matched_definitions
 
             if found_in_uses or found_in_text:
                 detected_definitions[def_key] = (spec, [rule_section])
@@ -383,9 +440,7 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
                 detected_definitions[def_key][1].append(rule_section)
                 continue
 
-            found_in_text = _text_contains_definition(rule_text, spec)
-
-            if found_in_text:
+            if def_key in matched_definitions:
                 detected_definitions[def_key] = (spec, [rule_section])
 
     for def_key, (spec, affected_sections) in detected_definitions.items():
@@ -396,9 +451,10 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
         question_id = f"clarify_{def_key}"
 
         if _is_value_set(current_value):
-            if not _assumption_already_exists(existing_assumptions, spec.field_name):
+            if spec.field_name not in existing_assumption_fields:
+                existing_assumption_fields.add(spec.field_name)
                 new_assumptions.append(
-                    Assumption(
+                    _make_assumption(
                         id=f"confirmed_{def_key}",
                         description=f"User confirmed: {spec.field_name} = {current_value}",
                         field_name=spec.field_name,
@@ -407,7 +463,7 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
                         source=AssumptionSource.USER_STATED,
                         affects_rules=affected_sections,
                         can_invalidate_answer=False,
-                    ).model_dump()
+                    )
                 )
             continue
 
@@ -418,33 +474,36 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
             if is_original is None:
                 continue
 
-        if spec.missing_info_type.value not in existing_missing:
+        if (
+            spec.missing_info_type.value not in existing_missing
+            and spec.missing_info_type.value not in new_missing
+        ):
             new_missing.append(spec.missing_info_type.value)
 
         should_ask = (
             is_compliance_check and spec.priority <= 2
         ) or spec.priority == 1
 
-        if should_ask and not _question_already_exists(existing_questions, question_id):
-            options_dicts = None
-            if spec.options:
-                options_dicts = [opt.model_dump() for opt in spec.options]
-
-            new_questions.append(
-                ClarificationQuestion(
-                    id=question_id,
-                    question=spec.question,
-                    why_needed=spec.why_needed,
-                    field_name=spec.field_name,
-                    options=spec.options,
-                    priority=spec.priority,
-                    affects_rules=affected_sections,
-                ).model_dump()
-            )
+        if should_ask and question_id not in existing_question_ids:
+            existing_question_ids.add(question_id)
+            new_questions.append({
+                "id": question_id,
+                "question": spec.question,
+                "why_needed": spec.why_needed,
+                "field_name": spec.field_name,
+                "options": list(spec.options_dump) if spec.options_dump else None,
+                "priority": spec.priority,
+                "affects_rules": affected_sections,
+                "asked_at": None,
+                "answered": False,
+                "raw_answer": None,
+                "parsed_value": None,
+            })
         else:
-            if not _assumption_already_exists(existing_assumptions, spec.field_name):
+            if spec.field_name not in existing_assumption_fields:
+                existing_assumption_fields.add(spec.field_name)
                 new_assumptions.append(
-                    Assumption(
+                    _make_assumption(
                         id=f"assumed_{def_key}",
                         description=f"Assuming {spec.field_name} = {spec.default_value}",
                         field_name=spec.field_name,
@@ -453,7 +512,7 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
                         source=AssumptionSource.DEFAULT,
                         affects_rules=affected_sections,
                         can_invalidate_answer=True,
-                    ).model_dump()
+                    )
                 )
 
             if spec.caveat_if_assumed not in existing_caveats:
@@ -473,11 +532,6 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
             if critical_caveat not in existing_caveats and critical_caveat not in new_caveats:
                 new_caveats.insert(0, critical_caveat)
 
-    all_assumptions = existing_assumptions + new_assumptions
-    all_missing = list(set(existing_missing + new_missing))
-    all_questions = existing_questions + new_questions
-    all_caveats = existing_caveats + new_caveats
-
     reasoning_parts = []
     if detected_definitions:
         reasoning_parts.append(f"Detected {len(detected_definitions)} contextual dependencies")
@@ -490,17 +544,27 @@ async def assumption_analyzer_node(state: AgentState) -> dict[str, Any]:
 
     reasoning = "; ".join(reasoning_parts) if reasoning_parts else "No contextual issues detected"
 
-    logger.debug(f"Assumption analysis: {reasoning}")
+    logger.debug("Assumption analysis: %s", reasoning)
 
     return {
-        "assumptions": all_assumptions,
-        "missing_info": all_missing,
-        "clarification_questions": all_questions,
-        "caveats": all_caveats,
-        "reasoning_chain": add_reasoning_step(state, f"Analyzed assumptions: {reasoning}"),
+        "assumptions": new_assumptions,
+        "missing_info": new_missing,
+        "clarification_questions": new_questions,
+        "caveats": new_caveats,
+        "reasoning_chain": new_reasoning_step(f"Analyzed assumptions: {reasoning}"),
     }
 
 
+_COMPLIANCE_QUERY_TYPES: frozenset[str] = frozenset({"compliance_check", "calculation"})
+
+# In priority order
+_CRITICAL_COMPLIANCE_INFO: tuple[str, ...] = (
+    MissingInfoType.DRAWING.value,
+    MissingInfoType.ORIGINAL_HOUSE.value,
+    MissingInfoType.HOUSE_TYPE.value,
+)
+
+
 def get_critical_missing_info(state: AgentState) -> list[str]:
     """
     Get list of critical missing information that should block processing.
@@ -516,17 +580,8 @@ def get_critical_missing_info(state: AgentState) -> list[str]:
     Returns:
         List of critical MissingInfoType values
     """
-    missing = state.get("missing_info", [])
-    query_type = state.get("query_type", "")
-
-    critical = []
-
-    if query_type in {"compliance_check", "calculation"}:
-        if MissingInfoType.DRAWING.value in missing:
-            critical.append(MissingInfoType.DRAWING.value)
-        if MissingInfoType.ORIGINAL_HOUSE.value in missing:
-            critical.append(MissingInfoType.ORIGINAL_HOUSE.value)
-        if MissingInfoType.HOUSE_TYPE.value in missing:
-            critical.append(MissingInfoType.HOUSE_TYPE.value)
+    if state.get("query_type", "") not in _COMPLIANCE_QUERY_TYPES:
+        return []
 
-    return critical
+    missing = set(state.get("missing_info", []))
+    return [info for info in _CRITICAL_COMPLIANCE_INFO if info in missing]
@@ -6,14 +6,27 @@ Uses Shapely-based calculations via GeometryCalculator and SpatialInferenceEngin
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Any, Optional
+import threading
+from collections import OrderedDict
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 
+import numpy as np
+from shapely.ops import unary_union
+
+from app.agent.nodes._keywords import keyword_lookahead_re
 from app.agent.state import (
     AgentState,
     CalculationResult,
-    add_reasoning_step,
+    CalculationResultDict,
+    new_reasoning_step,
 )
+from app.geometry._kernels import shoelace_area
 from app.geometry.calculator import GeometryCalculator
 from app.geometry.spatial_inference import DrawingParser, SpatialInferenceEngine
 from app.geometry.types import SpatialAnalysisResult
@@ -21,13 +34,21 @@ from app.geometry.types import SpatialAnalysisResult
 logger = logging.getLogger(__name__)
 
 
-SANITY_LIMITS = {
-    "plot_area_sqm": (10.0, 10000.0),
-    "building_footprint_sqm": (5.0, 5000.0),
-    "building_height_m": (1.0, 20.0),
-    "eaves_height_m": (1.0, 15.0),
-    "distance_to_boundary_m": (0.0, 100.0),
-}
+# (field, label used in error messages, min, max)
+_SANITY_LIMITS: tuple[tuple[str, str, float, float], ...] = tuple(
+    (field, field.replace("_", " "), lo, hi)
+    for field, lo, hi in (
+        ("plot_area_sqm", 10.0, 10000.0),
+        ("building_footprint_sqm", 5.0, 5000.0),
+        ("building_height_m", 1.0, 20.0),
+        ("eaves_height_m", 1.0, 15.0),
+        ("distance_to_boundary_m", 0.0, 100.0),
+    )
+)
+
+_LIMIT_FIELDS = tuple(field for field, _, _, _ in _SANITY_LIMITS)
+_LIMIT_LO = np.array([lo for _, _, lo, _ in _SANITY_LIMITS], dtype=np.float64)
+_LIMIT_HI = np.array([hi for _, _, _, hi in _SANITY_LIMITS], dtype=np.float64)
 
 
 def _validate_geometry(drawing_ctx: dict) -> list[str]:
@@ -44,18 +65,137 @@ def _validate_geometry(drawing_ctx: dict) -> list[str]:
                 "Please check your drawing measurements."
             )
 
-    for field, (min_val, max_val) in SANITY_LIMITS.items():
-        value = drawing_ctx.get(field)
-        if value is not None:
-            if value < min_val or value > max_val:
-                errors.append(
-                    f"Unusual {field.replace('_', ' ')}: {value}. "
-                    f"Expected range: {min_val}-{max_val}."
-                )
+    # Missing fields become NaN, which compares False against both bounds
+    values = np.fromiter(
+        (
+            np.nan if (value := drawing_ctx.get(field)) is None else value
+            for field in _LIMIT_FIELDS
+        ),
+        dtype=np.float64,
+        count=len(_LIMIT_FIELDS),
+    )
+    out_of_range = (values < _LIMIT_LO) | (values > _LIMIT_HI)
+
+    for index in np.flatnonzero(out_of_range):
+        field, label, min_val, max_val = _SANITY_LIMITS[index]
+        errors.append(
+            f"Unusual {label}: {drawing_ctx[field]}. "
+            f"Expected range: {min_val}-{max_val}."
+        )
 
     return errors
 
 
+CALCULATION_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "area": ("area", "size", "square", "coverage", "50%", "curtilage"),
+    "distance": ("distance", "boundary", "metres from", "within", "how far", "2m"),
+    "height": ("height", "tall", "eaves", "ridge", "metres high"),
+    "extension": ("extension", "depth", "project", "extend", "rear", "beyond"),
+    "width": ("width", "side"),
+}
+
+# Pending calculation types from the clarification router, by category
+_PENDING_CALCULATION_CATEGORIES: dict[str, str] = {
+    "coverage_percentage": "area",
+    "boundary_distance": "distance",
+    "height_check": "height",
+    "extension_depth": "extension",
+}
+
+_KEYWORD_TO_CALCULATION: dict[str, str] = {
+    keyword: category
+    for category, keywords in CALCULATION_KEYWORDS.items()
+    for keyword in keywords
+}
+
+_CALCULATION_KEYWORD_RE = keyword_lookahead_re(_KEYWORD_TO_CALCULATION)
+
+
+def _match_calculation_keywords(query: str) -> set[str]:
+    """Find the calculation categories whose keywords appear in a lowercased query."""
+    return {
+        _KEYWORD_TO_CALCULATION[match.group(1)]
+        for match in _CALCULATION_KEYWORD_RE.finditer(query)
+    }
+
+
+DRAWING_ANALYSIS_CACHE_SIZE = 128
+GEOMETRY_WORKERS = 4
+
+
+def _drawing_cache_key(raw_objects: list[dict], session_meta: dict) -> str:
+    """Stable digest of the inputs to drawing parsing and spatial analysis."""
+    payload = json.dumps(
+        [raw_objects, session_meta],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _combined_walls(parsed: dict[str, Any]) -> Any:
+    """Union of the parsed walls, computed once and memoized on the parsed dict.
+
+    Parsed drawings are cached across turns, so the union is shared by
+    every calculation on the same drawing.
+    """
+    combined = parsed.get("_combined_walls")
+    if combined is None:
+        combined = parsed["_combined_walls"] = unary_union(parsed.get("walls", []))
+    return combined
+
+
+def _limit_margin(
+    value: float,
+    limit: float,
+    minimum: bool = False,
+) -> tuple[float, bool]:
+    """Headroom against a limit and whether the value complies.
+
+    Args:
+        value: Measured value
+        limit: Regulatory limit
+        minimum: True if the limit is a minimum (e.g. a boundary distance)
+            rather than a maximum
+
+    Returns:
+        (margin, compliant), where a positive margin is headroom
+    """
+    margin = value - limit if minimum else limit - value
+    return margin, margin >= 0
+
+
+def _make_result(
+    calculation_type: str,
+    result: float,
+    unit: str,
+    input_values: Optional[dict[str, Any]] = None,
+    limit: Optional[float] = None,
+    limit_source: Optional[str] = None,
+    compliant: Optional[bool] = None,
+    margin: Optional[float] = None,
+    notes: Optional[str] = None,
+) -> CalculationResultDict:
+    """Build a calculation result dict matching CalculationResult.model_dump().
+
+    Results are built from values this module computes, so the Pydantic
+    round trip is skipped; calculate() validates them when DEBUG logging
+    is enabled.
+    """
+    return {
+        "calculation_type": calculation_type,
+        "input_values": input_values if input_values is not None else {},
+        "result": float(result),
+        "unit": unit,
+        "limit": limit,
+        "limit_source": limit_source,
+        "compliant": compliant,
+        "margin": margin,
+        "notes": notes,
+    }
+
+
 class CalculatorNode:
     """LangGraph node that performs geometric calculations on drawing data.
 
@@ -69,6 +209,14 @@ class CalculatorNode:
         self.calculator = GeometryCalculator()
         self.inference_engine = SpatialInferenceEngine()
         self.drawing_parser = DrawingParser()
+        self._analysis_cache: OrderedDict[
+            str, tuple[Optional[dict[str, Any]], Optional[SpatialAnalysisResult]]
+        ] = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=GEOMETRY_WORKERS,
+            thread_name_prefix="calculator",
+        )
 
     def __call__(self, state: AgentState) -> dict[str, Any]:
         """Process drawing context and perform calculations."""
@@ -95,8 +243,7 @@ class CalculatorNode:
                 "calculation_results": [],
                 "spatial_analysis": None,
                 "pending_calculations": [],
-                "reasoning_chain": add_reasoning_step(
-                    state,
+                "reasoning_chain": new_reasoning_step(
                     "No drawing context for calculations",
                 ),
             }
@@ -111,34 +258,43 @@ class CalculatorNode:
                 "pending_calculations": [],
                 "errors": state.get("errors", []) + geometry_errors,
                 "should_escalate": True,
-                "reasoning_chain": add_reasoning_step(
-                    state,
+                "reasoning_chain": new_reasoning_step(
                     f"Geometry validation failed: {len(geometry_errors)} issues",
                 ),
             }
 
-        # Parse raw drawing objects if available
-        parsed = self._parse_objects(raw_objects) if raw_objects else None
+        # Skip drawing analysis entirely when nothing will be calculated
+        needs = self._determine_needs(pending, query)
+        if not needs:
+            return {
+                "calculation_results": [],
+                "spatial_analysis": None,
+                "pending_calculations": [],
+                "reasoning_chain": new_reasoning_step(
+                    "No calculations requested, skipping drawing analysis",
+                ),
+            }
 
-        # Perform spatial analysis if we have parsed geometry
+        # Parse raw drawing objects and run spatial analysis if available
+        parsed = None
         spatial_analysis = None
-        spatial_dict = None
-        if parsed and parsed.get("walls"):
-            spatial_analysis = self._perform_spatial_analysis(parsed, session_meta)
-            spatial_dict = (
-                spatial_analysis.to_dict() if spatial_analysis else None
-            )
+        if raw_objects:
+            parsed, spatial_analysis = self._analyze_drawing(raw_objects, session_meta)
+        spatial_dict = spatial_analysis.to_dict() if spatial_analysis else None
 
         # Perform calculations
         results = self._perform_calculations(
             drawing_ctx=drawing_ctx,
             parsed=parsed,
             spatial=spatial_analysis,
-            pending=pending,
-            query=query,
+            needs=needs,
             session_meta=session_meta,
         )
 
+        if logger.isEnabledFor(logging.DEBUG):
+            for r in results:
+                CalculationResult.model_validate(r)
+
         compliant_count = sum(1 for r in results if r.get("compliant", True))
         total_count = len(results)
 
@@ -152,7 +308,7 @@ class CalculatorNode:
             "calculation_results": results,
             "spatial_analysis": spatial_dict,
             "pending_calculations": [],
-            "reasoning_chain": add_reasoning_step(state, reasoning),
+            "reasoning_chain": new_reasoning_step(reasoning),
         }
 
     def _extract_session_metadata(self, drawing_ctx: dict) -> dict:
@@ -166,6 +322,36 @@ class CalculatorNode:
             "building_height_m": drawing_ctx.get("building_height_m"),
         }
 
+    def _analyze_drawing(
+        self,
+        raw_objects: list[dict],
+        session_meta: dict,
+    ) -> tuple[Optional[dict[str, Any]], Optional[SpatialAnalysisResult]]:
+        """Parse the drawing and run spatial analysis, reusing cached results.
+
+        The same drawing is usually analyzed again on every turn of a
+        session, so results are kept in a small LRU cache keyed by the raw
+        objects and the session metadata the inference engine reads.
+        """
+        key = _drawing_cache_key(raw_objects, session_meta)
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(key)
+                return cached
+
+        parsed = self._parse_objects(raw_objects)
+        spatial_analysis = None
+        if parsed and parsed.get("walls"):
+            spatial_analysis = self._perform_spatial_analysis(parsed, session_meta)
+
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = (parsed, spatial_analysis)
+            if len(self._analysis_cache) > DRAWING_ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+
+        return parsed, spatial_analysis
+
     def _parse_objects(self, raw_objects: list[dict]) -> Optional[dict[str, Any]]:
         """Parse raw drawing objects into Shapely geometries."""
         if not raw_objects:
@@ -196,114 +382,140 @@ class CalculatorNode:
             logger.warning(f"Spatial analysis failed: {e}")
             return None
 
+    def _determine_needs(self, pending: list[str], query: str) -> set[str]:
+        """Determine which calculation categories the pending list and query ask for.
+
+        Returns:
+            Subset of CALCULATION_KEYWORDS categories
+        """
+        needs = _match_calculation_keywords(query)
+        needs.update(
+            _PENDING_CALCULATION_CATEGORIES[calculation]
+            for calculation in pending
+            if calculation in _PENDING_CALCULATION_CATEGORIES
+        )
+        return needs
+
     def _perform_calculations(
         self,
         drawing_ctx: dict,
         parsed: Optional[dict],
         spatial: Optional[SpatialAnalysisResult],
-        pending: list[str],
-        query: str,
+        needs: set[str],
         session_meta: dict,
-    ) -> list[dict]:
+    ) -> list[CalculationResultDict]:
         """Perform all requested calculations."""
-        results: list[dict] = []
-
-        # Determine what calculations to perform
-        needs_area = "coverage_percentage" in pending or self._needs_area(query)
-        needs_distance = "boundary_distance" in pending or self._needs_distance(query)
-        needs_height = "height_check" in pending or self._needs_height(query)
-        needs_extension = "extension_depth" in pending or self._needs_extension(query)
-        needs_width = "width" in query.lower() or "side" in query.lower()
+        needs_area = "area" in needs
+        needs_distance = "distance" in needs
+        needs_height = "height" in needs
+        needs_extension = "extension" in needs
+        needs_width = "width" in needs
 
         # Use geometry engine if we have parsed geometry
         if parsed:
+            branches: list[tuple[Callable[..., list[CalculationResultDict]], tuple]] = []
             if needs_area:
-                results.extend(self._calculate_areas_from_geometry(parsed, spatial))
+                branches.append((self._calculate_areas_from_geometry, (parsed, spatial)))
             if needs_distance:
-                results.extend(self._calculate_distances_from_geometry(parsed))
+                branches.append((self._calculate_distances_from_geometry, (parsed,)))
             if needs_extension and spatial:
-                results.extend(
-                    self._calculate_extension_depth_from_geometry(parsed, spatial)
+                branches.append(
+                    (self._calculate_extension_depth_from_geometry, (parsed, spatial))
                 )
             if needs_width and spatial:
-                results.extend(self._calculate_widths_from_geometry(spatial))
-        else:
-            # Fallback to pre-calculated values from drawing context
-            prior_extensions = drawing_ctx.get("prior_extensions_sqm", 0.0) or 0.0
-            house_type = drawing_ctx.get("house_type")
-
-            if needs_area:
-                calc = self._calculate_coverage_from_context(
-                    drawing_ctx, prior_extensions
-                )
-                if calc:
-                    results.append(calc.model_dump())
+                branches.append((self._calculate_widths_from_geometry, (spatial,)))
+
+            # Each branch fills its own slot, so results keep branch order
+            # without any shared list
+            if len(branches) > 1:
+                # Branches are independent and GEOS releases the GIL, so run
+                # them concurrently
+                futures = [self._pool.submit(fn, *args) for fn, args in branches]
+                branch_results = [future.result() for future in futures]
+            else:
+                branch_results = [fn(*args) for fn, args in branches]
+            return list(chain.from_iterable(branch_results))
+
+        # Fallback to pre-calculated values from drawing context
+        results: list[CalculationResultDict] = []
+        prior_extensions = drawing_ctx.get("prior_extensions_sqm", 0.0) or 0.0
+
+        if needs_area:
+            calc = self._calculate_coverage_from_context(
+                drawing_ctx, prior_extensions
+            )
+            if calc:
+                results.append(calc)
 
-            if needs_distance:
-                calc = self._calculate_boundary_distance_from_context(drawing_ctx)
-                if calc:
-                    results.append(calc.model_dump())
+        if needs_distance:
+            calc = self._calculate_boundary_distance_from_context(drawing_ctx)
+            if calc:
+                results.append(calc)
 
-            if needs_height:
-                calc = self._calculate_height_from_context(drawing_ctx)
-                if calc:
-                    results.append(calc.model_dump())
+        if needs_height:
+            calc = self._calculate_height_from_context(drawing_ctx)
+            if calc:
+                results.append(calc)
 
         return results
 
     def _needs_area(self, query: str) -> bool:
-        keywords = ["area", "size", "square", "coverage", "50%", "curtilage"]
-        return any(kw in query for kw in keywords)
+        return "area" in _match_calculation_keywords(query)
 
     def _needs_distance(self, query: str) -> bool:
-        keywords = ["distance", "boundary", "metres from", "within", "how far", "2m"]
-        return any(kw in query for kw in keywords)
+        return "distance" in _match_calculation_keywords(query)
 
     def _needs_height(self, query: str) -> bool:
-        keywords = ["height", "tall", "eaves", "ridge", "metres high"]
-        return any(kw in query for kw in keywords)
+        return "height" in _match_calculation_keywords(query)
 
     def _needs_extension(self, query: str) -> bool:
-        keywords = ["extension", "depth", "project", "extend", "rear", "beyond"]
-        return any(kw in query for kw in keywords)
+        return "extension" in _match_calculation_keywords(query)
 
     def _calculate_areas_from_geometry(
         self,
         parsed: dict,
         spatial: Optional[SpatialAnalysisResult],
-    ) -> list[dict]:
+    ) -> list[CalculationResultDict]:
         """Calculate areas using Shapely geometry."""
         results = []
-        from shapely.ops import unary_union
 
         plot_boundary = parsed.get("plot_boundary")
         walls = parsed.get("walls", [])
 
         if plot_boundary:
-            area_result = self.calculator.calculate_polygon_area(
-                list(plot_boundary.exterior.coords)
-            )
+            if plot_boundary.is_valid:
+                plot_xy = np.asarray(plot_boundary.exterior.coords, dtype=np.float64)
+                plot_area = round(
+                    shoelace_area(plot_xy[:, 0], plot_xy[:, 1])
+                    * self.calculator.MM2_TO_M2,
+                    2,
+                )
+            else:
+                # Invalid rings need the buffer(0) repair in calculate_polygon_area
+                plot_area = self.calculator.calculate_polygon_area(
+                    list(plot_boundary.exterior.coords)
+                )["area"]
             results.append(
-                CalculationResult(
+                _make_result(
                     calculation_type="area",
                     input_values={"source": "plot_boundary"},
-                    result=area_result["area"],
+                    result=plot_area,
                     unit="m²",
                     notes="Plot boundary (curtilage) area from geometry",
-                ).model_dump()
+                )
             )
 
         if walls:
-            combined = unary_union(walls)
+            combined = _combined_walls(parsed)
             building_area = combined.area * self.calculator.MM2_TO_M2
             results.append(
-                CalculationResult(
+                _make_result(
                     calculation_type="area",
                     input_values={"source": "walls"},
                     result=round(building_area, 2),
                     unit="m²",
                     notes="Total building footprint from geometry",
-                ).model_dump()
+                )
             )
 
         if plot_boundary and walls:
@@ -312,7 +524,7 @@ class CalculatorNode:
             )
             coverage = self.calculator.calculate_curtilage_coverage(
                 plot_boundary=plot_boundary,
-                buildings=walls,
+                buildings=[_combined_walls(parsed)],
                 original_house=original_footprint,
             )
 
@@ -320,7 +532,7 @@ class CalculatorNode:
             margin = 50.0 - coverage["coverage_percent"]
 
             results.append(
-                CalculationResult(
+                _make_result(
                     calculation_type="coverage_percentage",
                     input_values={
                         "building_area_m2": coverage["building_area_m2"],
@@ -333,36 +545,37 @@ class CalculatorNode:
                     compliant=compliant,
                     margin=round(margin, 1),
                     notes=f"Remaining allowance: {coverage['remaining_allowance_m2']}m²",
-                ).model_dump()
+                )
             )
 
         return results
 
-    def _calculate_distances_from_geometry(self, parsed: dict) -> list[dict]:
+    def _calculate_distances_from_geometry(
+        self,
+        parsed: dict,
+    ) -> list[CalculationResultDict]:
         """Calculate distances using Shapely geometry."""
         results = []
-        from shapely.ops import unary_union
 
         walls = parsed.get("walls", [])
         plot_boundary = parsed.get("plot_boundary")
 
         if walls and plot_boundary:
-            combined = unary_union(walls)
+            combined = _combined_walls(parsed)
             dist_result = self.calculator.calculate_min_distance_to_boundary(
                 building=combined,
                 boundary=plot_boundary,
             )
 
             distance_m = dist_result["min_distance_m"]
-            compliant = distance_m >= 2.0
-            margin = distance_m - 2.0
+            margin, compliant = _limit_margin(distance_m, 2.0, minimum=True)
 
             notes = None
             if not compliant:
                 notes = "Within 2m of boundary - eaves height limited to 3m"
 
             results.append(
-                CalculationResult(
+                _make_result(
                     calculation_type="boundary_distance",
                     input_values={
                         "nearest_building_point": dist_result["nearest_building_point"],
@@ -375,7 +588,7 @@ class CalculatorNode:
                     compliant=compliant,
                     margin=round(margin, 2),
                     notes=notes,
-                ).model_dump()
+                )
             )
 
         return results
@@ -384,7 +597,7 @@ class CalculatorNode:
         self,
         parsed: dict,
         spatial: SpatialAnalysisResult,
-    ) -> list[dict]:
+    ) -> list[CalculationResultDict]:
         """Calculate extension depth using Shapely geometry."""
         results = []
 
@@ -403,13 +616,13 @@ class CalculatorNode:
                 )
 
                 results.append(
-                    CalculationResult(
+                    _make_result(
                         calculation_type="extension_depth",
                         input_values={"extension_index": i + 1},
                         result=depth_result["depth_m"],
                         unit="metres",
                         notes=f"Extension {i + 1} depth beyond rear wall",
-                    ).model_dump()
+                    )
                 )
 
         return results
@@ -417,7 +630,7 @@ class CalculatorNode:
     def _calculate_widths_from_geometry(
         self,
         spatial: SpatialAnalysisResult,
-    ) -> list[dict]:
+    ) -> list[CalculationResultDict]:
         """Calculate building widths using Shapely geometry."""
         results = []
 
@@ -426,18 +639,18 @@ class CalculatorNode:
             width_result = self.calculator.calculate_building_width(original)
 
             results.append(
-                CalculationResult(
+                _make_result(
                     calculation_type="width",
                     input_values={"source": "original_footprint"},
                     result=width_result["width_m"],
                     unit="metres",
                     notes="Original house width",
-                ).model_dump()
+                )
             )
 
             half_width = round(width_result["width_m"] / 2, 2)
             results.append(
-                CalculationResult(
+                _make_result(
                     calculation_type="max_side_extension_width",
                     input_values={"original_width_m": width_result["width_m"]},
                     result=half_width,
@@ -445,7 +658,7 @@ class CalculatorNode:
                     limit=half_width,
                     limit_source="Class A.1(j)(iii) - half width rule",
                     notes="Maximum allowed side extension width (50% of original)",
-                ).model_dump()
+                )
             )
 
         return results
@@ -454,7 +667,7 @@ class CalculatorNode:
         self,
         drawing_ctx: dict,
         prior_extensions_sqm: float = 0.0,
-    ) -> Optional[CalculationResult]:
+    ) -> Optional[CalculationResultDict]:
         """Fallback: Calculate coverage from pre-calculated context values."""
         plot_area = drawing_ctx.get("plot_area_sqm")
         building_footprint = drawing_ctx.get("building_footprint_sqm")
@@ -463,14 +676,13 @@ class CalculatorNode:
             return None
 
         percentage = (building_footprint / plot_area) * 100
-        compliant = percentage <= 50.0
-        margin = 50.0 - percentage
+        margin, compliant = _limit_margin(percentage, 50.0)
 
         notes = None
         if prior_extensions_sqm > 0:
             notes = f"Includes {prior_extensions_sqm}m² of prior extensions"
 
-        return CalculationResult(
+        return _make_result(
             calculation_type="coverage_percentage",
             input_values={
                 "building_footprint_sqm": building_footprint,
@@ -489,21 +701,20 @@ class CalculatorNode:
     def _calculate_boundary_distance_from_context(
         self,
         drawing_ctx: dict,
-    ) -> Optional[CalculationResult]:
+    ) -> Optional[CalculationResultDict]:
         """Fallback: Calculate boundary distance from pre-calculated context."""
         distance = drawing_ctx.get("distance_to_boundary_m")
 
         if distance is None:
             return None
 
-        compliant = distance >= 2.0
-        margin = distance - 2.0
+        margin, compliant = _limit_margin(distance, 2.0, minimum=True)
 
         notes = None
         if not compliant:
             notes = "Within 2m of boundary - eaves height limited to 3m"
 
-        return CalculationResult(
+        return _make_result(
             calculation_type="boundary_distance",
             input_values={"distance_to_boundary_m": distance},
             result=round(distance, 2),
@@ -518,7 +729,7 @@ class CalculatorNode:
     def _calculate_height_from_context(
         self,
         drawing_ctx: dict,
-    ) -> Optional[CalculationResult]:
+    ) -> Optional[CalculationResultDict]:
         """Fallback: Calculate height compliance from pre-calculated context."""
         building_height = drawing_ctx.get("building_height_m")
         eaves_height = drawing_ctx.get("eaves_height_m")
@@ -535,11 +746,10 @@ class CalculatorNode:
             limit = 4.0
             limit_source = "Class A.1(ja) - single storey max height"
 
-        compliant = check_height <= limit
-        margin = limit - check_height
+        margin, compliant = _limit_margin(check_height, limit)
         height_type = "eaves" if eaves_height else "building"
 
-        return CalculationResult(
+        return _make_result(
             calculation_type="height_check",
             input_values={
                 f"{height_type}_height_m": check_height,
@@ -563,6 +773,8 @@ async def calculator_node(state: AgentState) -> dict[str, Any]:
     """Async wrapper for CalculatorNode.
 
     This is the LangGraph node entry point that performs geometric calculations.
+    The Shapely work is synchronous, so it runs in a worker thread to keep
+    the event loop free for other sessions.
 
     Args:
         state: Current agent state with drawing_context and raw_drawing_objects
@@ -570,4 +782,4 @@ async def calculator_node(state: AgentState) -> dict[str, Any]:
     Returns:
         State updates with calculation_results and spatial_analysis
     """
-    return _calculator.calculate(state)
+    return await asyncio.to_thread(_calculator.calculate, state)
@@ -3,28 +3,70 @@
 from __future__ import annotations
 
 import logging
+import re
+from dataclasses import dataclass
 from typing import Any
 
 from app.agent.state import (
     AgentState,
     MissingInfoType,
     QueryType,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 
 logger = logging.getLogger(__name__)
 
 
-CRITICAL_MISSING_TYPES = {
+CRITICAL_MISSING_TYPES = frozenset({
     MissingInfoType.DRAWING.value,
     MissingInfoType.ORIGINAL_HOUSE.value,
     MissingInfoType.HOUSE_TYPE.value,
-}
+})
 
-IMPORTANT_MISSING_TYPES = {
+IMPORTANT_MISSING_TYPES = frozenset({
     MissingInfoType.DESIGNATED_LAND.value,
     MissingInfoType.PRIOR_EXTENSIONS.value,
-}
+})
+
+_COMPLIANCE_QUERY_TYPES = frozenset({
+    QueryType.COMPLIANCE_CHECK.value,
+    QueryType.CALCULATION.value,
+})
+
+
+CALCULATION_TRIGGERS = (
+    "50%", "curtilage", "coverage",
+    "2 metres", "boundary",
+    "height", "metres",
+    "area", "distance",
+)
+
+_CALCULATION_TRIGGER_RE = re.compile(
+    "|".join(re.escape(trigger) for trigger in CALCULATION_TRIGGERS)
+)
+
+
+@dataclass(slots=True, frozen=True)
+class _RouterView:
+    """Router inputs read from the state mapping once per node call."""
+
+    query_type: str
+    user_query: str
+    drawing_ctx: dict | None
+    retrieved_rules: list[dict]
+    missing_info: frozenset[str]
+    clarification_questions: list[dict]
+
+    @classmethod
+    def from_state(cls, state: AgentState) -> _RouterView:
+        return cls(
+            query_type=state.get("query_type", ""),
+            user_query=state.get("user_query", ""),
+            drawing_ctx=state.get("drawing_context"),
+            retrieved_rules=state.get("retrieved_rules", []),
+            missing_info=frozenset(state.get("missing_info", [])),
+            clarification_questions=state.get("clarification_questions", []),
+        )
 
 
 def _get_unanswered_questions(
@@ -38,46 +80,34 @@ def _get_unanswered_questions(
     ]
 
 
-def _has_pending_calculations(state: AgentState) -> bool:
-    """Check if calculations are needed based on query type and drawing."""
-    query_type = state.get("query_type", "")
-    drawing_ctx = state.get("drawing_context")
+def _scan_calculations(view: _RouterView) -> tuple[bool, list[str]]:
+    """
+    Decide whether calculations are needed and which ones, in one text pass.
 
-    if query_type not in {QueryType.COMPLIANCE_CHECK.value, QueryType.CALCULATION.value}:
-        return False
+    The retrieved rule text is joined and lowercased once and used both to
+    gate on calculation triggers and to pick the pending calculations.
 
-    if not drawing_ctx or not drawing_ctx.get("has_drawing"):
-        return False
-
-    retrieved_rules = state.get("retrieved_rules", [])
+    Args:
+        view: Router inputs read from the current agent state
 
-    calculation_triggers = [
-        "50%", "curtilage", "coverage",
-        "2 metres", "boundary",
-        "height", "metres",
-        "area", "distance",
-    ]
+    Returns:
+        Tuple of (calculations needed, pending calculation names)
+    """
+    if view.query_type not in _COMPLIANCE_QUERY_TYPES:
+        return False, []
 
-    for rule in retrieved_rules:
-        text = rule.get("text", "").lower()
-        if any(trigger in text for trigger in calculation_triggers):
-            return True
+    drawing_ctx = view.drawing_ctx
+    if not drawing_ctx or not drawing_ctx.get("has_drawing"):
+        return False, []
 
-    return False
+    rules_text = " ".join(r.get("text", "") for r in view.retrieved_rules).lower()
 
+    if not _CALCULATION_TRIGGER_RE.search(rules_text):
+        return False, []
 
-def _determine_pending_calculations(state: AgentState) -> list[str]:
-    """Determine what calculations are needed based on rules and query."""
+    # Keep a separator so words cannot run together across the query/rules seam
     pending: list[str] = []
-
-    query = state.get("user_query", "").lower()
-    retrieved_rules = state.get("retrieved_rules", [])
-    drawing_ctx = state.get("drawing_context")
-
-    if not drawing_ctx or not drawing_ctx.get("has_drawing"):
-        return pending
-
-    all_text = query + " ".join(r.get("text", "") for r in retrieved_rules).lower()
+    all_text = f"{view.user_query.lower()} {rules_text}"
 
     if "50%" in all_text or "curtilage" in all_text or "coverage" in all_text:
         pending.append("coverage_percentage")
@@ -91,7 +121,7 @@ def _determine_pending_calculations(state: AgentState) -> list[str]:
     if "rear" in all_text and any(kw in all_text for kw in ["extension", "project", "depth"]):
         pending.append("extension_depth")
 
-    return pending
+    return True, pending
 
 
 async def clarification_router_node(state: AgentState) -> dict[str, Any]:
@@ -109,24 +139,19 @@ async def clarification_router_node(state: AgentState) -> dict[str, Any]:
     Returns:
         State updates with awaiting_clarification flag and pending_calculations
     """
-    missing_info = set(state.get("missing_info", []))
-    questions = state.get("clarification_questions", [])
-    query_type = state.get("query_type", "")
+    view = _RouterView.from_state(state)
+    missing_info = view.missing_info
+    questions = view.clarification_questions
 
-    is_compliance = query_type in {
-        QueryType.COMPLIANCE_CHECK.value,
-        QueryType.CALCULATION.value,
-    }
+    is_compliance = view.query_type in _COMPLIANCE_QUERY_TYPES
 
     critical_missing = missing_info & CRITICAL_MISSING_TYPES
 
     if MissingInfoType.DRAWING.value in critical_missing:
-        unanswered = _get_unanswered_questions(questions, max_priority=1)
         return {
             "awaiting_clarification": True,
             "pending_calculations": [],
-            "reasoning_chain": add_reasoning_step(
-                state,
+            "reasoning_chain": new_reasoning_step(
                 "Drawing required but not uploaded, requesting upload",
             ),
         }
@@ -138,12 +163,11 @@ async def clarification_router_node(state: AgentState) -> dict[str, Any]:
         ]
 
         if priority_1_questions:
-            logger.debug(f"Found {len(priority_1_questions)} priority-1 questions")
+            logger.debug("Found %d priority-1 questions", len(priority_1_questions))
             return {
                 "awaiting_clarification": True,
                 "pending_calculations": [],
-                "reasoning_chain": add_reasoning_step(
-                    state,
+                "reasoning_chain": new_reasoning_step(
                     f"Need clarification: {len(priority_1_questions)} critical questions",
                 ),
             }
@@ -164,31 +188,27 @@ async def clarification_router_node(state: AgentState) -> dict[str, Any]:
                 return {
                     "awaiting_clarification": True,
                     "pending_calculations": [],
-                    "reasoning_chain": add_reasoning_step(
-                        state,
+                    "reasoning_chain": new_reasoning_step(
                         f"Need clarification for compliance: {len(priority_2_non_answered)} questions",
                     ),
                 }
 
-    if _has_pending_calculations(state):
-        pending = _determine_pending_calculations(state)
-        if pending:
-            logger.debug(f"Proceeding to calculator: {pending}")
-            return {
-                "awaiting_clarification": False,
-                "pending_calculations": pending,
-                "reasoning_chain": add_reasoning_step(
-                    state,
-                    f"Proceeding with {len(pending)} calculations: {', '.join(pending)}",
-                ),
-            }
+    needs_calculations, pending = _scan_calculations(view)
+    if needs_calculations and pending:
+        logger.debug("Proceeding to calculator: %s", pending)
+        return {
+            "awaiting_clarification": False,
+            "pending_calculations": pending,
+            "reasoning_chain": new_reasoning_step(
+                f"Proceeding with {len(pending)} calculations: {', '.join(pending)}",
+            ),
+        }
 
     logger.debug("Skipping calculator, proceeding to reasoner")
     return {
         "awaiting_clarification": False,
         "pending_calculations": [],
-        "reasoning_chain": add_reasoning_step(
-            state,
+        "reasoning_chain": new_reasoning_step(
             "No calculations needed, proceeding to reasoning",
         ),
     }
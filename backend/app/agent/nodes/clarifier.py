@@ -2,29 +2,30 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
 import re
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Callable
 
 from openai import AsyncOpenAI
 
 from app.config import get_settings
+from app.agent.nodes._single_flight import SingleFlight
+from app.agent.nodes._ttl_cache import TTLCache
 from app.agent.state import (
     AgentState,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 
 logger = logging.getLogger(__name__)
 
 
-CLARIFIER_PROMPT = """You are helping a user understand why we need certain information for their UK planning permission question.
+# Fixed instructions go in the system message so providers can cache the
+# shared prompt prefix; only the user message varies between calls
+CLARIFIER_SYSTEM_PROMPT = """You are helping a user understand why we need certain information for their UK planning permission question.
 
-User's original question: {query}
-
-We need to clarify the following to give an accurate answer:
-
-{questions_formatted}
+You will be given the user's original question and the points we need to clarify to give an accurate answer.
 
 Generate a friendly, conversational message that:
 1. Acknowledges their question briefly
@@ -38,6 +39,13 @@ Do not use bullet points for the main response - use numbered questions if multi
 Format: Just the message text, no JSON or special formatting."""
 
 
+CLARIFIER_USER_PROMPT = """User's original question: {query}
+
+We need to clarify the following to give an accurate answer:
+
+{questions_formatted}"""
+
+
 FALLBACK_TEMPLATE = """To give you an accurate answer about your planning question, I need a bit more information:
 
 {questions_text}
@@ -45,6 +53,25 @@ FALLBACK_TEMPLATE = """To give you an accurate answer about your planning questi
 This will help me check the specific rules that apply to your situation."""
 
 
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+CLARIFIER_CACHE_SIZE = 256
+CLARIFIER_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Generated messages keyed by model and rendered prompt
+_message_cache: TTLCache[str, str] = TTLCache(CLARIFIER_CACHE_SIZE, CLARIFIER_CACHE_TTL_SECONDS)
+
+
+_inflight_messages = SingleFlight()
+
+
+def _message_cache_key(model: str, prompt: str) -> str:
+    """Stable digest of the inputs that determine a clarification message."""
+    return hashlib.blake2b(
+        f"{model}\0{prompt}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
 def _format_questions_for_prompt(questions: list[dict]) -> str:
     """Format clarification questions for the LLM prompt."""
     parts = []
@@ -98,9 +125,30 @@ def _parse_llm_response(response_text: str) -> str:
     return text.strip()
 
 
+async def _stream_completion(
+    openai_client: AsyncOpenAI,
+    on_token: Callable[[str], None],
+    **request: Any,
+) -> str:
+    """Run a streamed chat completion, forwarding each content delta."""
+    stream = await openai_client.chat.completions.create(**request, stream=True)
+
+    parts: list[str] = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_token(delta)
+
+    return "".join(parts)
+
+
 async def clarifier_node(
     state: AgentState,
     openai_client: AsyncOpenAI | None = None,
+    on_token: Callable[[str], None] | None = None,
 ) -> dict[str, Any]:
     """
     Generate user-friendly clarification questions.
@@ -111,6 +159,8 @@ async def clarifier_node(
     Args:
         state: Current agent state with clarification_questions
         openai_client: Optional OpenAI client for LLM generation
+        on_token: Optional callback; when given, the LLM response is streamed
+            and each text delta is passed to it as it arrives
 
     Returns:
         State updates with final_answer containing the clarification request
@@ -128,8 +178,7 @@ async def clarifier_node(
         return {
             "final_answer": "I have all the information I need. Let me process your question.",
             "awaiting_clarification": False,
-            "reasoning_chain": add_reasoning_step(
-                state,
+            "reasoning_chain": new_reasoning_step(
                 "No questions to ask, proceeding",
             ),
         }
@@ -143,22 +192,50 @@ async def clarifier_node(
         try:
             questions_formatted = _format_questions_for_prompt(questions_to_ask)
 
-            prompt = CLARIFIER_PROMPT.format(
+            prompt = CLARIFIER_USER_PROMPT.format(
                 query=query,
                 questions_formatted=questions_formatted,
             )
 
-            response = await openai_client.chat.completions.create(
-                model=settings.agent_clarifier_model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=500,
-            )
-
-            raw_response = response.choices[0].message.content or ""
-            clarification_message = _parse_llm_response(raw_response)
-
-            logger.debug("Generated clarification message via LLM")
+            cache_key = _message_cache_key(settings.agent_clarifier_model, prompt)
+            cached_message = _message_cache.get(cache_key)
+
+            if cached_message is not None:
+                clarification_message = cached_message
+                if on_token:
+                    on_token(cached_message)
+                logger.debug("Reused cached clarification message")
+            else:
+                request = {
+                    "model": settings.agent_clarifier_model,
+                    "messages": [
+                        {"role": "system", "content": CLARIFIER_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": 500,
+                }
+
+                async def request_message() -> str:
+                    if on_token:
+                        return await _stream_completion(
+                            openai_client, on_token, **request
+                        )
+                    response = await openai_client.chat.completions.create(**request)
+                    return response.choices[0].message.content or ""
+
+                # Concurrent identical prompts share one LLM call
+                raw_response, shared = await _inflight_messages.run(
+                    cache_key, request_message
+                )
+                if shared and on_token:
+                    on_token(raw_response)
+
+                clarification_message = _parse_llm_response(raw_response)
+                if clarification_message:
+                    _message_cache.set(cache_key, clarification_message)
+
+                logger.debug("Generated clarification message via LLM")
 
         except Exception as e:
             logger.warning(f"Clarifier LLM call failed: {e}")
@@ -166,16 +243,15 @@ async def clarifier_node(
     else:
         clarification_message = _format_fallback_message(questions_to_ask)
 
+    asked_at = datetime.now(timezone.utc).isoformat()
     for q in questions_to_ask:
-        from datetime import datetime, timezone
-        q["asked_at"] = datetime.now(timezone.utc).isoformat()
+        q["asked_at"] = asked_at
 
     return {
         "final_answer": clarification_message,
         "awaiting_clarification": True,
         "clarification_questions": questions,
-        "reasoning_chain": add_reasoning_step(
-            state,
+        "reasoning_chain": new_reasoning_step(
             f"Generated clarification request with {len(questions_to_ask)} questions",
         ),
     }
@@ -199,6 +275,7 @@ def parse_clarification_response(
     """
     updates: dict[str, Any] = {}
     response_lower = user_response.lower().strip()
+    numbers = _NUMBER_RE.findall(response_lower)
 
     for question in questions:
         if question.get("answered", False):
@@ -225,7 +302,6 @@ def parse_clarification_response(
                     question["parsed_value"] = updates[field_name]
                     break
         else:
-            numbers = re.findall(r"(\d+(?:\.\d+)?)", response_lower)
             if numbers and field_name in ("prior_extensions_sqm", "year_of_prior_extension"):
                 value = float(numbers[0])
                 if field_name == "year_of_prior_extension":
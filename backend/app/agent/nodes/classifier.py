@@ -1,5 +1,6 @@
 """Classifier node for determining query type and intent."""
 
+import hashlib
 import json
 import logging
 import re
@@ -8,20 +9,24 @@ from typing import Any
 from openai import AsyncOpenAI
 
 from app.config import get_settings
+from app.agent.nodes._keywords import keyword_lookahead_re
+from app.agent.nodes._single_flight import SingleFlight
+from app.agent.nodes._ttl_cache import TTLCache
 from app.agent.state import (
     AgentState,
     ClarificationQuestion,
     MissingInfoType,
     QueryType,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 
 logger = logging.getLogger(__name__)
 
-CLASSIFIER_PROMPT = """Classify this user query for a UK planning permission assistant.
+# Fixed instructions go in the system message so providers can cache the
+# shared prompt prefix; only the user message varies between calls
+CLASSIFIER_SYSTEM_PROMPT = """Classify user queries for a UK planning permission assistant.
 
-Query: {query}
-Has Drawing Uploaded: {has_drawing}
+Each message gives the query and whether the user has uploaded a drawing.
 
 Categories:
 1. GENERAL - Conceptual questions about planning permission
@@ -39,12 +44,15 @@ Categories:
    Note: Requires a drawing to be uploaded
 
 Respond with JSON only:
-{{
+{
     "query_type": "GENERAL" | "LEGAL_SEARCH" | "COMPLIANCE_CHECK" | "CALCULATION",
     "intent": "Brief description of what the user wants (max 20 words)",
     "requires_drawing": true | false,
     "confidence": "high" | "medium" | "low"
-}}"""
+}"""
+
+CLASSIFIER_USER_PROMPT = """Query: {query}
+Has Drawing Uploaded: {has_drawing}"""
 
 GENERAL_PHRASE_PATTERNS = [
     "what is ", "what are ", "what does ", "what do ",
@@ -73,6 +81,92 @@ LEGAL_SEARCH_KEYWORDS = [
     "permitted depth", "can you build",
 ]
 
+# Conversational openers that need no planning classification
+GREETING_PATTERNS = (
+    "hi", "hello", "hey", "good morning", "good afternoon", "good evening",
+    "what's up", "whats up", "how are you", "how r u", "sup",
+    "what are you", "who are you", "what can you do",
+)
+
+
+# A greeting pattern making up the whole query or followed by a space or "?"
+_GREETING_RE = re.compile(
+    "(?:" + "|".join(re.escape(p) for p in GREETING_PATTERNS) + r")(?:[ ?]|\Z)"
+)
+
+# Words that mark a query as being about planning or building work
+PLANNING_KEYWORDS = (
+    "planning", "permission", "extension", "build", "house", "property",
+    "development", "permitted", "boundary", "height", "depth", "area",
+    "garage", "shed", "conservatory", "loft", "roof", "wall", "fence",
+    "garden", "patio", "deck", "outbuilding", "annexe", "convert",
+    "regulation", "rule", "limit", "maximum", "minimum", "comply",
+)
+
+_PLANNING_KEYWORD_RE = re.compile("|".join(re.escape(kw) for kw in PLANNING_KEYWORDS))
+
+
+def has_planning_keyword(query: str) -> bool:
+    """Check if a lowercased query mentions any planning-related keyword."""
+    return _PLANNING_KEYWORD_RE.search(query) is not None
+
+
+def is_greeting_query(query: str) -> bool:
+    """Check if a query is only a greeting or a question about the assistant.
+
+    A greeting followed by a planning question ("hi, can I build a loft?")
+    is not a greeting and still needs classifying.
+    """
+    query_lower = query.lower().strip()
+    return (
+        _GREETING_RE.match(query_lower) is not None
+        and not has_planning_keyword(query_lower)
+    )
+
+
+# Phrases only count as general at the start of the query or after a space
+_GENERAL_PHRASE_RE = re.compile(
+    "(?:^| )(?:" + "|".join(re.escape(p) for p in GENERAL_PHRASE_PATTERNS) + ")"
+)
+
+# Rule/limit questions phrased like definitions are legal searches
+_LEGAL_EXCLUSION_RE = re.compile(r"what is the (?:max|limit|rule)")
+
+_KEYWORD_TO_BUCKET: dict[str, str] = {
+    **{kw: "calculation" for kw in CALCULATION_KEYWORDS},
+    **{kw: "compliance" for kw in COMPLIANCE_KEYWORDS},
+    **{kw: "legal_search" for kw in LEGAL_SEARCH_KEYWORDS},
+}
+
+_CLASSIFY_KEYWORD_RE = keyword_lookahead_re(_KEYWORD_TO_BUCKET)
+
+
+def _match_keyword_buckets(query_lower: str) -> set[str]:
+    """Find which keyword buckets have a match in a lowercased query."""
+    return {
+        _KEYWORD_TO_BUCKET[match.group(1)]
+        for match in _CLASSIFY_KEYWORD_RE.finditer(query_lower)
+    }
+
+
+_REQUIRES_DRAWING = frozenset({QueryType.COMPLIANCE_CHECK, QueryType.CALCULATION})
+
+CLASSIFIER_CACHE_SIZE = 1024
+CLASSIFIER_CACHE_TTL_SECONDS = 60 * 60
+
+# LLM decisions keyed by model, normalized query and drawing flag
+_decision_cache: TTLCache[str, tuple[QueryType, str]] = TTLCache(
+    CLASSIFIER_CACHE_SIZE, CLASSIFIER_CACHE_TTL_SECONDS
+)
+
+
+def _decision_cache_key(model: str, query: str, has_drawing: bool) -> str:
+    """Stable digest of the inputs that determine a classification."""
+    normalized = query.strip().lower()
+    return hashlib.blake2b(
+        f"{model}\0{has_drawing}\0{normalized}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
 
 def _keyword_classify(query: str, has_drawing: bool) -> tuple[QueryType, str]:
     """Fallback keyword-based classification with proper priority."""
@@ -80,52 +174,103 @@ def _keyword_classify(query: str, has_drawing: bool) -> tuple[QueryType, str]:
 
     # Priority 1: Check for definitional/explanatory questions FIRST
     # These take precedence even if they contain words like "permitted"
-    for pattern in GENERAL_PHRASE_PATTERNS:
-        if query_lower.startswith(pattern) or f" {pattern}" in query_lower:
-            # But exclude "what is the max/limit" which is a legal search
-            if not any(lk in query_lower for lk in ["what is the max", "what is the limit", "what is the rule"]):
-                return QueryType.GENERAL, "general question about planning concepts"
+    # But exclude "what is the max/limit" which is a legal search
+    if _GENERAL_PHRASE_RE.search(query_lower) and not _LEGAL_EXCLUSION_RE.search(query_lower):
+        return QueryType.GENERAL, "general question about planning concepts"
+
+    buckets = _match_keyword_buckets(query_lower)
 
     # Priority 2: Explicit calculation requests
-    if any(kw in query_lower for kw in CALCULATION_KEYWORDS):
+    if "calculation" in buckets:
         if has_drawing:
             return QueryType.CALCULATION, "calculate requested measurement"
         return QueryType.LEGAL_SEARCH, "question about measurements (no drawing)"
 
     # Priority 3: Compliance check patterns (requires drawing context)
-    if any(kw in query_lower for kw in COMPLIANCE_KEYWORDS):
+    if "compliance" in buckets:
         if has_drawing:
             return QueryType.COMPLIANCE_CHECK, "check compliance of drawing"
         return QueryType.LEGAL_SEARCH, "question about compliance rules"
 
     # Priority 4: Legal search for specific rules/limits
-    if any(kw in query_lower for kw in LEGAL_SEARCH_KEYWORDS):
+    if "legal_search" in buckets:
         return QueryType.LEGAL_SEARCH, "question about specific planning rules"
 
     # Default: legal search for anything planning-related
     return QueryType.LEGAL_SEARCH, "question about planning rules"
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
 def _parse_llm_response(response_text: str) -> dict[str, Any] | None:
-    """Parse JSON from LLM response, handling markdown code blocks."""
-    text = response_text.strip()
-
-    json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-    if json_match:
-        text = json_match.group(1)
-    elif text.startswith("{"):
-        pass
-    else:
-        brace_start = text.find("{")
-        brace_end = text.rfind("}")
-        if brace_start != -1 and brace_end != -1:
-            text = text[brace_start:brace_end + 1]
+    """Parse the first JSON object in an LLM response.
+
+    raw_decode stops at the end of the balanced object, so markdown code
+    fences and surrounding prose need no separate stripping pass.
+    """
+    brace_start = response_text.find("{")
+    while brace_start != -1:
+        try:
+            result, _ = _JSON_DECODER.raw_decode(response_text, brace_start)
+        except json.JSONDecodeError:
+            brace_start = response_text.find("{", brace_start + 1)
+        else:
+            return result
+
+    return None
+
+
+_inflight_classifications = SingleFlight()
+
+
+async def _classify_with_llm(
+    openai_client: AsyncOpenAI,
+    model: str,
+    query: str,
+    has_drawing: bool,
+) -> tuple[QueryType, str] | None:
+    """Classify a query with the LLM.
+
+    Returns:
+        Tuple of (query_type, intent), or None if the call failed or the
+        response could not be used
+    """
+    try:
+        prompt = CLASSIFIER_USER_PROMPT.format(
+            query=query,
+            has_drawing=has_drawing,
+        )
+
+        response = await openai_client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": CLASSIFIER_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.0,
+            max_tokens=200,
+        )
+
+        result = _parse_llm_response(response.choices[0].message.content or "")
+    except Exception as e:
+        logger.warning(f"Classification LLM call failed: {e}")
+        return None
+
+    if not result or "query_type" not in result:
+        logger.debug("LLM parse failed, using keyword fallback")
+        return None
 
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        query_type = QueryType(str(result["query_type"]).lower())
+    except ValueError:
+        logger.debug("LLM returned an unknown query type, using keyword fallback")
         return None
 
+    intent = result.get("intent", "")
+    logger.debug("LLM classified as %s: %s", query_type.value, intent)
+    return query_type, intent
+
 
 async def classifier_node(
     state: AgentState,
@@ -158,39 +303,31 @@ async def classifier_node(
     intent: str
     classification_method = "keyword"
 
-    if openai_client:
-        try:
-            prompt = CLASSIFIER_PROMPT.format(
-                query=query,
-                has_drawing=has_drawing,
-            )
-
-            response = await openai_client.chat.completions.create(
-                model=settings.agent_classifier_model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=200,
-            )
+    cache_key = _decision_cache_key(settings.agent_classifier_model, query, has_drawing)
+    cached_decision = _decision_cache.get(cache_key) if openai_client else None
+
+    if is_greeting_query(query):
+        # Greetings are answered by the reasoner without retrieval, so the
+        # LLM would have nothing to decide
+        query_type, intent = QueryType.GENERAL, "greeting or question about the assistant"
+        classification_method = "greeting"
+    elif cached_decision is not None:
+        query_type, intent = cached_decision
+        classification_method = "cached"
+    elif openai_client:
+        # Concurrent identical requests share one LLM call
+        decision, _ = await _inflight_classifications.run(
+            cache_key,
+            lambda: _classify_with_llm(
+                openai_client, settings.agent_classifier_model, query, has_drawing
+            ),
+        )
 
-            result = _parse_llm_response(response.choices[0].message.content or "")
-
-            if result and "query_type" in result:
-                type_str = result["query_type"].upper()
-                try:
-                    query_type = QueryType(type_str.lower())
-                except ValueError:
-                    query_type, intent = _keyword_classify(query, has_drawing)
-                else:
-                    intent = result.get("intent", "")
-                    classification_method = "llm"
-
-                logger.debug(f"LLM classified as {query_type.value}: {intent}")
-            else:
-                query_type, intent = _keyword_classify(query, has_drawing)
-                logger.debug(f"LLM parse failed, keyword fallback: {query_type.value}")
-
-        except Exception as e:
-            logger.warning(f"Classification LLM call failed: {e}")
+        if decision is not None:
+            query_type, intent = decision
+            classification_method = "llm"
+            _decision_cache.set(cache_key, (query_type, intent))
+        else:
             query_type, intent = _keyword_classify(query, has_drawing)
     else:
         query_type, intent = _keyword_classify(query, has_drawing)
@@ -198,16 +335,12 @@ async def classifier_node(
     updates: dict[str, Any] = {
         "query_type": query_type.value,
         "query_intent": intent,
-        "reasoning_chain": add_reasoning_step(
-            state,
+        "reasoning_chain": new_reasoning_step(
             f"Classified as {query_type.value} ({classification_method}): {intent}",
         ),
     }
 
-    requires_drawing = query_type in {
-        QueryType.COMPLIANCE_CHECK,
-        QueryType.CALCULATION,
-    }
+    requires_drawing = query_type in _REQUIRES_DRAWING
 
     if requires_drawing and not has_drawing:
         missing = list(state.get("missing_info", []))
@@ -234,8 +367,7 @@ async def classifier_node(
 
         updates["missing_info"] = missing
         updates["clarification_questions"] = questions
-        updates["reasoning_chain"] = add_reasoning_step(
-            state,
+        updates["reasoning_chain"] += new_reasoning_step(
             "Drawing required but not uploaded - flagged for clarification",
         )
 
@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import logging
+import re
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+import shapely
+
 if TYPE_CHECKING:
     from redis.asyncio import Redis
 
@@ -14,35 +19,70 @@ from app.agent.state import (
     DesignatedLandType,
     DrawingContext,
     HouseType,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 from app.repositories.session_repository import SessionRepository
 
 logger = logging.getLogger(__name__)
 
 
-UNIT_CONVERSIONS = {
-    "mm": {"to_m": 0.001, "to_sqm": 0.000001},
-    "cm": {"to_m": 0.01, "to_sqm": 0.0001},
-    "m": {"to_m": 1.0, "to_sqm": 1.0},
-    "in": {"to_m": 0.0254, "to_sqm": 0.00064516},
-    "ft": {"to_m": 0.3048, "to_sqm": 0.092903},
+LENGTH_TO_M = {
+    "mm": 0.001,
+    "cm": 0.01,
+    "m": 1.0,
+    "in": 0.0254,
+    "ft": 0.3048,
 }
 
+AREA_TO_SQM = {
+    "mm": 0.000001,
+    "cm": 0.0001,
+    "m": 1.0,
+    "in": 0.00064516,
+    "ft": 0.092903,
+}
 
-def _convert_to_metres(value: float, unit: str) -> float | None:
-    """Convert a length value to metres. Returns None for unknown units."""
-    unit_lower = unit.lower()
-    if unit_lower in UNIT_CONVERSIONS:
-        return value * UNIT_CONVERSIONS[unit_lower]["to_m"]
-    return None
+# Layer classes for closed polylines when totalling areas
+_LAYER_PLOT = 1
+_LAYER_BUILDING = 2
+
+_PLOT_LAYER_RE = re.compile(r"plot|boundary|curtilage")
+_BUILDING_LAYER_RE = re.compile(r"wall|building|house")
+
+_USER_METADATA_KEYS = (
+    "house_type", "is_original_house", "prior_extensions_sqm",
+    "designated_land_type", "article_4_direction",
+)
+
+# Valid values for enum-typed user metadata, checked without constructing enums
+_ENUM_METADATA_VALUES: dict[str, frozenset[str]] = {
+    "house_type": frozenset(e.value for e in HouseType),
+    "designated_land_type": frozenset(e.value for e in DesignatedLandType),
+}
+
+_EMPTY_CONTEXT_TEMPLATE: dict[str, Any] = DrawingContext(
+    session_id="",
+    has_drawing=False,
+).model_dump()
 
+MEASUREMENT_CACHE_SIZE = 256
 
-def _convert_to_sqm(value: float, unit: str) -> float | None:
-    """Convert an area value to square metres. Returns None for unknown units."""
-    unit_lower = unit.lower()
-    if unit_lower in UNIT_CONVERSIONS:
-        return value * UNIT_CONVERSIONS[unit_lower]["to_sqm"]
+# Measurements keyed by (session_id, context_version), oldest first. A new
+# upload bumps the version, so entries never need invalidating.
+_measurement_cache: OrderedDict[tuple[str, int], dict[str, Any]] = OrderedDict()
+
+
+def _empty_drawing_context(session_id: str) -> dict[str, Any]:
+    """Build the drawing context dict for a session without a usable drawing."""
+    return {**_EMPTY_CONTEXT_TEMPLATE, "session_id": session_id, "layers_present": []}
+
+
+def _classify_layer(layer: str) -> int | None:
+    """Return the area class for a lowercased layer name, or None if irrelevant."""
+    if _PLOT_LAYER_RE.search(layer):
+        return _LAYER_PLOT
+    if _BUILDING_LAYER_RE.search(layer):
+        return _LAYER_BUILDING
     return None
 
 
@@ -54,12 +94,14 @@ def _extract_measurements_from_objects(
     Extract basic measurements from drawing objects.
 
     This provides rough estimates. Phase 5 Calculator will provide
-    precise measurements using Shapely.
+    precise measurements using Shapely. Closed polylines are collected
+    first and their areas computed in one vectorized Shapely call.
     """
     measurements: dict[str, Any] = {}
     coord_unit = metadata.get("coordinate_unit", "mm")
+    unit_key = coord_unit.lower()
 
-    if coord_unit.lower() not in UNIT_CONVERSIONS:
+    if unit_key not in LENGTH_TO_M:
         logger.warning(f"Unknown coordinate unit '{coord_unit}', skipping measurements")
         measurements["unit_warning"] = f"Unknown unit: {coord_unit}"
         return measurements
@@ -69,59 +111,81 @@ def _extract_measurements_from_objects(
         width = bounding_box.get("max_x", 0) - bounding_box.get("min_x", 0)
         height = bounding_box.get("max_y", 0) - bounding_box.get("min_y", 0)
 
-        width_m = _convert_to_metres(width, coord_unit)
-        height_m = _convert_to_metres(height, coord_unit)
-
-        if width_m is not None and height_m is not None:
-            measurements["bounding_width_m"] = width_m
-            measurements["bounding_height_m"] = height_m
+        to_m = LENGTH_TO_M[unit_key]
+        measurements["bounding_width_m"] = width * to_m
+        measurements["bounding_height_m"] = height * to_m
 
-    plot_area = None
-    building_area = None
+    coords: list[np.ndarray] = []
+    ring_ids: list[np.ndarray] = []
+    layer_classes: list[int] = []
 
     for obj in objects:
-        layer = obj.get("layer", "").lower()
-        obj_type = obj.get("type")
-
-        if obj_type == "POLYLINE" and obj.get("closed"):
-            points = obj.get("points", [])
-            if len(points) >= 3:
-                area_raw = _calculate_polygon_area(points)
-                area_sqm = _convert_to_sqm(area_raw, coord_unit)
-
-                if area_sqm is None:
-                    continue
-
-                if "plot" in layer or "boundary" in layer or "curtilage" in layer:
-                    if plot_area is None or area_sqm > plot_area:
-                        plot_area = area_sqm
-                elif "wall" in layer or "building" in layer or "house" in layer:
-                    if building_area is None:
-                        building_area = area_sqm
-                    else:
-                        building_area += area_sqm
-
-    if plot_area:
-        measurements["plot_area_sqm"] = round(plot_area, 2)
-    if building_area:
-        measurements["building_footprint_sqm"] = round(building_area, 2)
+        if obj.get("type") != "POLYLINE" or not obj.get("closed"):
+            continue
 
-    return measurements
+        points = obj.get("points", [])
+        if len(points) < 3:
+            continue
+
+        # Classify first so rings on irrelevant layers are never built
+        layer_class = _classify_layer(obj.get("layer", "").lower())
+        if layer_class is None:
+            continue
+
+        # Vertices may mix 2-D and 3-D points, so keep only x and y per point
+        ring = np.asarray([(p[0], p[1]) for p in points], dtype=np.float64)
+        if len(ring) == 3 and (ring[0] == ring[-1]).all():
+            # Already-closed ring of two distinct points has no area
+            continue
+
+        ring_ids.append(np.full(len(ring), len(coords)))
+        coords.append(ring)
+        layer_classes.append(layer_class)
 
+    if not coords:
+        return measurements
+
+    rings = shapely.linearrings(np.concatenate(coords), indices=np.concatenate(ring_ids))
+    areas = shapely.area(shapely.polygons(rings))
+    classes = np.asarray(layer_classes)
+
+    plot_areas = areas[classes == _LAYER_PLOT]
+    building_areas = areas[classes == _LAYER_BUILDING]
 
-def _calculate_polygon_area(points: list[tuple[float, float]]) -> float:
-    """Calculate polygon area using shoelace formula."""
-    n = len(points)
-    if n < 3:
-        return 0.0
+    to_sqm = AREA_TO_SQM[unit_key]
+    if plot_areas.size:
+        plot_area = float(plot_areas.max()) * to_sqm
+        if plot_area:
+            measurements["plot_area_sqm"] = round(plot_area, 2)
+    if building_areas.size:
+        building_area = float(building_areas.sum()) * to_sqm
+        if building_area:
+            measurements["building_footprint_sqm"] = round(building_area, 2)
+
+    return measurements
 
-    area = 0.0
-    for i in range(n):
-        j = (i + 1) % n
-        area += points[i][0] * points[j][1]
-        area -= points[j][0] * points[i][1]
 
-    return abs(area) / 2.0
+def _get_measurements(
+    session_id: str,
+    context_version: int | None,
+    objects: list[dict[str, Any]],
+    metadata: dict[str, Any],
+) -> dict[str, Any]:
+    """Return measurements for a drawing, reusing them for an unchanged upload."""
+    if context_version is None:
+        return _extract_measurements_from_objects(objects, metadata)
+
+    key = (session_id, context_version)
+    measurements = _measurement_cache.get(key)
+    if measurements is not None:
+        _measurement_cache.move_to_end(key)
+        return measurements
+
+    measurements = _extract_measurements_from_objects(objects, metadata)
+    _measurement_cache[key] = measurements
+    if len(_measurement_cache) > MEASUREMENT_CACHE_SIZE:
+        _measurement_cache.popitem(last=False)
+    return measurements
 
 
 def _parse_user_metadata(
@@ -132,29 +196,26 @@ def _parse_user_metadata(
     Extract user-provided metadata from session.
 
     This includes answers to clarification questions stored in the session.
+    Enum-typed values that are not recognised are dropped; None is kept.
     """
     user_data: dict[str, Any] = {}
 
-    for key in ["house_type", "is_original_house", "prior_extensions_sqm",
-                "designated_land_type", "article_4_direction"]:
+    for key in _USER_METADATA_KEYS:
         if key in session_meta:
             user_data[key] = session_meta[key]
         if key in context_meta:
             user_data[key] = context_meta[key]
 
-    if "house_type" in user_data:
-        try:
-            user_data["house_type"] = HouseType(user_data["house_type"]).value
-        except ValueError:
-            pass
-
-    if "designated_land_type" in user_data:
-        try:
-            user_data["designated_land_type"] = DesignatedLandType(
-                user_data["designated_land_type"]
-            ).value
-        except ValueError:
-            pass
+    for key, valid_values in _ENUM_METADATA_VALUES.items():
+        if key not in user_data:
+            continue
+        value = user_data[key]
+        if value is None:
+            # Answered as "unknown" during clarification
+            continue
+        if not isinstance(value, str) or value not in valid_values:
+            logger.warning(f"Ignoring unknown {key} value: {value!r}")
+            del user_data[key]
 
     return user_data
 
@@ -178,11 +239,8 @@ async def context_loader_node(
     if not session_id:
         logger.warning("No session_id in state")
         return {
-            "drawing_context": DrawingContext(
-                session_id="",
-                has_drawing=False,
-            ).model_dump(),
-            "reasoning_chain": add_reasoning_step(state, "No session ID provided"),
+            "drawing_context": _empty_drawing_context(""),
+            "reasoning_chain": new_reasoning_step("No session ID provided"),
         }
 
     if redis_client is None:
@@ -192,43 +250,30 @@ async def context_loader_node(
         except RuntimeError:
             logger.error("Redis not initialized")
             return {
-                "drawing_context": DrawingContext(
-                    session_id=session_id,
-                    has_drawing=False,
-                ).model_dump(),
+                "drawing_context": _empty_drawing_context(session_id),
                 "errors": state.get("errors", []) + ["Redis connection unavailable"],
-                "reasoning_chain": add_reasoning_step(state, "Redis unavailable"),
+                "reasoning_chain": new_reasoning_step("Redis unavailable"),
             }
 
     settings = get_settings()
     ttl_seconds = settings.session_ttl_hours * 3600
     repo = SessionRepository(redis_client, ttl_seconds)
 
-    session_meta = await repo.get_meta(session_id)
+    session_meta, context_data = await repo.get_meta_and_context(session_id)
     if session_meta is None:
         logger.info(f"Session not found: {session_id}")
         return {
-            "drawing_context": DrawingContext(
-                session_id=session_id,
-                has_drawing=False,
-            ).model_dump(),
-            "reasoning_chain": add_reasoning_step(
-                state,
+            "drawing_context": _empty_drawing_context(session_id),
+            "reasoning_chain": new_reasoning_step(
                 f"Session {session_id[:8]}... not found or expired",
             ),
         }
 
-    context_data = await repo.get_context(session_id)
-
     if context_data is None:
-        logger.debug(f"No drawing context in session: {session_id}")
+        logger.debug("No drawing context in session: %s", session_id)
         return {
-            "drawing_context": DrawingContext(
-                session_id=session_id,
-                has_drawing=False,
-            ).model_dump(),
-            "reasoning_chain": add_reasoning_step(
-                state,
+            "drawing_context": _empty_drawing_context(session_id),
+            "reasoning_chain": new_reasoning_step(
                 "Session found but no drawing uploaded",
             ),
         }
@@ -236,15 +281,19 @@ async def context_loader_node(
     objects = context_data.get("objects", [])
     metadata = context_data.get("metadata", {})
 
-    measurements = _extract_measurements_from_objects(objects, metadata)
+    measurements = _get_measurements(
+        session_id, session_meta.get("context_version"), objects, metadata
+    )
     user_metadata = _parse_user_metadata(session_meta, metadata)
 
-    drawing_context = DrawingContext(
+    # Every value is either computed here, written by the upload service, or
+    # checked by _parse_user_metadata, so validation would only repeat work
+    drawing_context = DrawingContext.model_construct(
         session_id=session_id,
         has_drawing=True,
         plot_area_sqm=measurements.get("plot_area_sqm"),
         building_footprint_sqm=measurements.get("building_footprint_sqm"),
-        layers_present=metadata.get("layers_present", []),
+        layers_present=list(metadata.get("layers_present", [])),
         **user_metadata,
     )
 
@@ -257,11 +306,11 @@ async def context_loader_node(
     if measurements.get("building_footprint_sqm"):
         reasoning += f", {measurements['building_footprint_sqm']}m2 building"
 
-    logger.debug(f"Loaded context for session {session_id}: {reasoning}")
+    logger.debug("Loaded context for session %s: %s", session_id, reasoning)
 
     return {
         "drawing_context": drawing_context.model_dump(),
-        "reasoning_chain": add_reasoning_step(state, reasoning),
+        "reasoning_chain": new_reasoning_step(reasoning),
     }
 
 
@@ -305,8 +354,7 @@ async def update_context_from_clarification(
 
     return {
         "drawing_context": ctx_dict,
-        "reasoning_chain": add_reasoning_step(
-            state,
+        "reasoning_chain": new_reasoning_step(
             f"Updated {field_name} from clarification response",
         ),
     }
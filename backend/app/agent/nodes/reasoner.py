@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import re
 from typing import Any
 
 from openai import AsyncOpenAI
@@ -13,8 +14,9 @@ from app.agent.state import (
     ConfidenceLevel,
     MissingInfoType,
     QueryType,
-    add_reasoning_step,
+    new_reasoning_step,
 )
+from app.agent.nodes.classifier import has_planning_keyword, is_greeting_query
 from app.agent.prompts.reasoner import (
     REASONER_SYSTEM_PROMPT,
     build_reasoner_prompt,
@@ -32,34 +34,28 @@ TEMPORAL_KEYWORDS = [
     "as it stood",
 ]
 
+_TEMPORAL_RE = re.compile("|".join(re.escape(kw) for kw in TEMPORAL_KEYWORDS))
+
+ORIGINAL_HOUSE_CAVEAT = (
+    "This assessment references the 'original' house. "
+    "If your property has been extended before, "
+    "your actual allowance may be less than calculated."
+)
+
 
 def _check_for_temporal_issues(
     rules: list[dict],
     drawing_ctx: dict | None,
 ) -> list[str]:
     """Backup check for temporal issues in rules."""
-    caveats = []
-
-    if not drawing_ctx:
-        return caveats
-
-    is_original_confirmed = drawing_ctx.get("is_original_house") is not None
+    if not drawing_ctx or drawing_ctx.get("is_original_house") is not None:
+        return []
 
     for rule in rules:
-        text = rule.get("text", "").lower()
-        for keyword in TEMPORAL_KEYWORDS:
-            if keyword in text:
-                if not is_original_confirmed:
-                    caveat = (
-                        "This assessment references the 'original' house. "
-                        "If your property has been extended before, "
-                        "your actual allowance may be less than calculated."
-                    )
-                    if caveat not in caveats:
-                        caveats.append(caveat)
-                    break
-
-    return caveats
+        if _TEMPORAL_RE.search(rule.get("text", "").lower()):
+            return [ORIGINAL_HOUSE_CAVEAT]
+
+    return []
 
 
 def _determine_confidence(state: AgentState) -> str:
@@ -87,21 +83,17 @@ def _determine_confidence(state: AgentState) -> str:
 
 def _get_compliance_verdict(calculations: list[dict]) -> str | None:
     """Determine overall compliance verdict from calculations."""
-    if not calculations:
-        return None
-
-    all_compliant = all(
-        c.get("compliant", True)
-        for c in calculations
-        if c.get("compliant") is not None
-    )
-
-    has_any_check = any(c.get("compliant") is not None for c in calculations)
+    has_any_check = False
+    for c in calculations:
+        compliant = c.get("compliant")
+        if compliant is None:
+            continue
+        if not compliant:
+            # Any failing check decides the verdict
+            return "NON_COMPLIANT"
+        has_any_check = True
 
-    if not has_any_check:
-        return None
-
-    return "COMPLIANT" if all_compliant else "NON_COMPLIANT"
+    return "COMPLIANT" if has_any_check else None
 
 
 async def reasoner_node(
@@ -162,7 +154,7 @@ async def reasoner_node(
                 "How do I check if I need planning permission?",
             ],
             "caveats": [],
-            "reasoning_chain": add_reasoning_step(state, "Responded to greeting/off-topic query"),
+            "reasoning_chain": new_reasoning_step("Responded to greeting/off-topic query"),
         }
 
     user_prompt = build_reasoner_prompt(
@@ -193,7 +185,7 @@ async def reasoner_node(
             final_answer = response.choices[0].message.content or ""
             final_answer = final_answer.strip()
 
-            logger.debug(f"Generated answer: {len(final_answer)} chars")
+            logger.debug("Generated answer: %d chars", len(final_answer))
 
         except Exception as e:
             logger.error(f"Reasoner LLM call failed: {e}")
@@ -231,7 +223,7 @@ async def reasoner_node(
         "confidence": confidence,
         "caveats": existing_caveats,
         "suggested_followups": suggested_followups,
-        "reasoning_chain": add_reasoning_step(state, reasoning),
+        "reasoning_chain": new_reasoning_step(reasoning),
     }
 
 
@@ -240,29 +232,12 @@ def _is_off_topic_query(query: str) -> bool:
     query_lower = query.lower().strip()
 
     # Greetings and conversational patterns
-    greeting_patterns = [
-        "hi", "hello", "hey", "good morning", "good afternoon", "good evening",
-        "what's up", "whats up", "how are you", "how r u", "sup",
-        "what are you", "who are you", "what can you do",
-    ]
-
-    for pattern in greeting_patterns:
-        if query_lower == pattern or query_lower.startswith(pattern + " ") or query_lower.startswith(pattern + "?"):
-            return True
+    if is_greeting_query(query_lower):
+        return True
 
     # Very short queries without planning-related keywords
-    planning_keywords = [
-        "planning", "permission", "extension", "build", "house", "property",
-        "development", "permitted", "boundary", "height", "depth", "area",
-        "garage", "shed", "conservatory", "loft", "roof", "wall", "fence",
-        "garden", "patio", "deck", "outbuilding", "annexe", "convert",
-        "regulation", "rule", "limit", "maximum", "minimum", "comply",
-    ]
-
-    if len(query_lower) < 20:
-        has_planning_keyword = any(kw in query_lower for kw in planning_keywords)
-        if not has_planning_keyword:
-            return True
+    if len(query_lower) < 20 and not has_planning_keyword(query_lower):
+        return True
 
     return False
 
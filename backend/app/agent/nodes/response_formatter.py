@@ -8,7 +8,7 @@ from typing import Any
 from app.agent.state import (
     AgentState,
     ConfidenceLevel,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 
 logger = logging.getLogger(__name__)
@@ -28,52 +28,50 @@ DISCLAIMER = (
 )
 
 
-def _format_assumptions_section(assumptions: list[dict]) -> str | None:
-    """Format assumptions into a readable section."""
-    if not assumptions:
-        return None
+# Blank line and rule written before every section after the answer
+SECTION_BREAK = ("", "---")
 
-    user_stated = [a for a in assumptions if a.get("source") == "user_stated"]
-    defaulted = [a for a in assumptions if a.get("source") == "default"]
-
-    parts = []
 
-    if defaulted:
-        parts.append("**Assumptions Made:**")
-        for a in defaulted:
-            desc = a.get("description", "")
-            if desc.startswith("Assuming "):
-                desc = desc[9:]
-            parts.append(f"- {desc}")
+def _append_assumptions_section(parts: list[str], assumptions: list[dict]) -> bool:
+    """Append defaulted assumptions to parts. Returns True if a section was added."""
+    defaulted = [a for a in assumptions if a.get("source") == "default"]
+    if not defaulted:
+        return False
 
-    return "\n".join(parts) if parts else None
+    parts.extend(SECTION_BREAK)
+    parts.append("**Assumptions Made:**")
+    for a in defaulted:
+        desc = a.get("description", "")
+        if desc.startswith("Assuming "):
+            desc = desc[9:]
+        parts.append(f"- {desc}")
+    return True
 
 
-def _format_caveats_section(caveats: list[str]) -> str | None:
-    """Format caveats into a readable section."""
+def _append_caveats_section(parts: list[str], caveats: list[str]) -> bool:
+    """Append caveats to parts. Returns True if a section was added."""
     if not caveats:
-        return None
+        return False
 
-    parts = ["**Important Caveats:**"]
+    parts.extend(SECTION_BREAK)
+    parts.append("**Important Caveats:**")
     for caveat in caveats:
         caveat_text = caveat
         if caveat.startswith("IMPORTANT: "):
             caveat_text = caveat[11:]
         parts.append(f"- {caveat_text}")
-
-    return "\n".join(parts)
+    return True
 
 
-def _format_followups_section(followups: list[str]) -> str | None:
-    """Format follow-up suggestions into a readable section."""
+def _append_followups_section(parts: list[str], followups: list[str]) -> bool:
+    """Append follow-up suggestions to parts. Returns True if a section was added."""
     if not followups:
-        return None
+        return False
 
-    parts = ["**To get a more accurate assessment, you could:**"]
-    for f in followups:
-        parts.append(f"- {f}")
-
-    return "\n".join(parts)
+    parts.extend(SECTION_BREAK)
+    parts.append("**To get a more accurate assessment, you could:**")
+    parts.extend(f"- {f}" for f in followups)
+    return True
 
 
 def _format_confidence_indicator(confidence: str) -> str:
@@ -112,50 +110,31 @@ async def response_formatter_node(state: AgentState) -> dict[str, Any]:
             "Please try rephrasing your question or contact your local planning authority."
         )
 
+    # Sections append straight into one list that is joined once
     parts = [final_answer]
+    sections_added = []
 
-    assumptions_section = _format_assumptions_section(assumptions)
-    if assumptions_section:
-        parts.append("")
-        parts.append("---")
-        parts.append(assumptions_section)
-
-    caveats_section = _format_caveats_section(caveats)
-    if caveats_section:
-        parts.append("")
-        parts.append("---")
-        parts.append(caveats_section)
-
-    if followups:
-        followups_section = _format_followups_section(followups)
-        if followups_section:
-            parts.append("")
-            parts.append("---")
-            parts.append(followups_section)
+    if _append_assumptions_section(parts, assumptions):
+        sections_added.append("assumptions")
+    if _append_caveats_section(parts, caveats):
+        sections_added.append("caveats")
+    if _append_followups_section(parts, followups):
+        sections_added.append("followups")
 
-    parts.append("")
-    parts.append("---")
+    parts.extend(SECTION_BREAK)
     parts.append(_format_confidence_indicator(confidence))
     parts.append("")
     parts.append(f"*{DISCLAIMER}*")
 
     formatted_answer = "\n".join(parts)
 
-    sections_added = []
-    if assumptions_section:
-        sections_added.append("assumptions")
-    if caveats_section:
-        sections_added.append("caveats")
-    if followups:
-        sections_added.append("followups")
-
     reasoning = f"Formatted response with {confidence} confidence"
     if sections_added:
         reasoning += f", added {', '.join(sections_added)}"
 
     return {
         "final_answer": formatted_answer,
-        "reasoning_chain": add_reasoning_step(state, reasoning),
+        "reasoning_chain": new_reasoning_step(reasoning),
     }
 
 
@@ -171,9 +150,4 @@ def extract_raw_answer(formatted_answer: str) -> str:
     Returns:
         Just the main answer text
     """
-    if "---" in formatted_answer:
-        parts = formatted_answer.split("---")
-        if parts:
-            return parts[0].strip()
-
-    return formatted_answer.strip()
+    return formatted_answer.partition("---")[0].strip()
@@ -1,12 +1,15 @@
 """Retriever node for fetching relevant rules from knowledge base."""
 
 import logging
+import re
 from typing import Any
+from weakref import WeakKeyDictionary
 
+from app.agent.nodes._keywords import keyword_lookahead_re
+from app.agent.nodes._ttl_cache import TTLCache
 from app.agent.state import (
     AgentState,
-    RetrievedRule,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 from app.services.retrieval.retriever import RetrieverService, RetrievalResult
 from app.services.retrieval.xref_resolver import EnhancedParent
@@ -38,12 +41,46 @@ GLOBAL_DEFINITIONS = {
     ),
 }
 
+_DEFINITION_TERM_RE = keyword_lookahead_re(GLOBAL_DEFINITIONS)
+
+_DESIGNATED_LAND_RE = re.compile(
+    r"article 2\(3\)|conservation area|national park|aonb|world heritage|the broads"
+)
+
+RETRIEVAL_CACHE_SIZE = 128
+RETRIEVAL_CACHE_TTL_SECONDS = 5 * 60
+
+# Retrieval results per service instance, keyed by normalized query. Weak
+# keys drop a service's results along with it, so a later service can
+# never be served them.
+_retrieval_cache: WeakKeyDictionary[
+    RetrieverService, TTLCache[str, RetrievalResult]
+] = WeakKeyDictionary()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_query(query: str) -> str:
+    """Case- and whitespace-normalize a query for use as a cache key."""
+    return _WHITESPACE_RE.sub(" ", query.strip().lower())
+
+
+def _service_retrieval_cache(
+    service: RetrieverService,
+) -> TTLCache[str, RetrievalResult]:
+    """Return the retrieval cache for a service instance, creating it if needed."""
+    cache = _retrieval_cache.get(service)
+    if cache is None:
+        cache = TTLCache(RETRIEVAL_CACHE_SIZE, RETRIEVAL_CACHE_TTL_SECONDS)
+        _retrieval_cache[service] = cache
+    return cache
+
 
 def _convert_enhanced_parent_to_rule(
     parent: EnhancedParent,
     is_exception: bool = False,
-) -> RetrievedRule:
-    """Convert Phase 3 EnhancedParent to RetrievedRule model."""
+) -> dict[str, Any]:
+    """Convert Phase 3 EnhancedParent to a RetrievedRule-shaped dict."""
     data = parent.parent_data
     content_index = data.get("content_index", {})
 
@@ -51,32 +88,26 @@ def _convert_enhanced_parent_to_rule(
     section = sections[0] if sections else None
 
     text = data.get("text", "")
-    text_lower = text.lower()
+    designated_land_specific = _DESIGNATED_LAND_RE.search(text.lower()) is not None
 
-    designated_land_specific = any(
-        kw in text_lower
-        for kw in ["article 2(3)", "conservation area", "national park",
-                   "aonb", "world heritage", "the broads"]
-    )
+    xrefs = [resolved.section for resolved in parent.resolved_xrefs]
 
-    xrefs = []
-    for resolved in parent.resolved_xrefs:
-        xrefs.append(resolved.section)
-
-    return RetrievedRule(
-        parent_id=parent.id,
-        text=text,
-        section=section,
-        page_start=data.get("page_start", 0),
-        page_end=data.get("page_end", 0),
-        source=data.get("source", ""),
-        relevance_score=parent.score,
-        uses_definitions=content_index.get("definitions_used", []),
-        xrefs=xrefs,
-        sections_covered=sections,
-        has_exceptions=is_exception or parent.is_xref_parent,
-        designated_land_specific=designated_land_specific,
-    )
+    # Keys and order match RetrievedRule.model_dump(); the values are already
+    # typed by the retrieval service, so the model is not built per rule
+    return {
+        "parent_id": parent.id,
+        "text": text,
+        "section": section,
+        "page_start": data.get("page_start", 0),
+        "page_end": data.get("page_end", 0),
+        "source": data.get("source", ""),
+        "relevance_score": parent.score,
+        "uses_definitions": list(content_index.get("definitions_used", [])),
+        "xrefs": xrefs,
+        "sections_covered": list(sections),
+        "has_exceptions": is_exception or parent.is_xref_parent,
+        "designated_land_specific": designated_land_specific,
+    }
 
 
 def _extract_rules_from_result(
@@ -91,16 +122,10 @@ def _extract_rules_from_result(
     primary_rules = []
     exception_rules = []
 
+    # has_exceptions already follows is_xref_parent, so no flag is passed
     for parent in result.enhanced_parents:
-        rule = _convert_enhanced_parent_to_rule(
-            parent,
-            is_exception=parent.is_xref_parent,
-        )
-
-        if parent.is_xref_parent:
-            exception_rules.append(rule.model_dump())
-        else:
-            primary_rules.append(rule.model_dump())
+        target = exception_rules if parent.is_xref_parent else primary_rules
+        target.append(_convert_enhanced_parent_to_rule(parent))
 
     return primary_rules, exception_rules
 
@@ -128,7 +153,7 @@ async def retriever_node(
             "applicable_exceptions": [],
             "context_text": "",
             "global_definitions": GLOBAL_DEFINITIONS,
-            "reasoning_chain": add_reasoning_step(state, "No query for retrieval"),
+            "reasoning_chain": new_reasoning_step("No query for retrieval"),
         }
 
     if retriever_service is None:
@@ -143,14 +168,19 @@ async def retriever_node(
                 "context_text": "",
                 "global_definitions": GLOBAL_DEFINITIONS,
                 "errors": state.get("errors", []) + [f"Retriever unavailable: {e}"],
-                "reasoning_chain": add_reasoning_step(
-                    state,
+                "reasoning_chain": new_reasoning_step(
                     "Retriever service unavailable",
                 ),
             }
 
+    cache = _service_retrieval_cache(retriever_service)
+    cache_key = _normalize_query(query)
+    result = cache.get(cache_key)
+
     try:
-        result = await retriever_service.retrieve(query)
+        if result is None:
+            result = await retriever_service.retrieve(query)
+            cache.set(cache_key, result)
     except Exception as e:
         logger.error(f"Retrieval failed: {e}")
         return {
@@ -159,7 +189,7 @@ async def retriever_node(
             "context_text": "",
             "global_definitions": GLOBAL_DEFINITIONS,
             "errors": state.get("errors", []) + [f"Retrieval failed: {e}"],
-            "reasoning_chain": add_reasoning_step(state, f"Retrieval error: {e}"),
+            "reasoning_chain": new_reasoning_step(f"Retrieval error: {e}"),
         }
 
     if not result.enhanced_parents:
@@ -169,8 +199,7 @@ async def retriever_node(
             "applicable_exceptions": [],
             "context_text": "",
             "global_definitions": GLOBAL_DEFINITIONS,
-            "reasoning_chain": add_reasoning_step(
-                state,
+            "reasoning_chain": new_reasoning_step(
                 "No relevant rules found in knowledge base",
             ),
         }
@@ -199,7 +228,7 @@ async def retriever_node(
         "applicable_exceptions": exception_rules,
         "context_text": context_text,
         "global_definitions": GLOBAL_DEFINITIONS,
-        "reasoning_chain": add_reasoning_step(state, reasoning),
+        "reasoning_chain": new_reasoning_step(reasoning),
     }
 
 
@@ -224,17 +253,21 @@ def get_definitions_for_rules(
         for defn in uses_defs:
             used_definitions.add(defn.lower())
 
-        text_lower = rule.get("text", "").lower()
-        for key in GLOBAL_DEFINITIONS:
-            if key in text_lower:
-                used_definitions.add(key)
+        for match in _DEFINITION_TERM_RE.finditer(rule.get("text", "").lower()):
+            used_definitions.add(match.group(1))
 
-    relevant = {}
-    for key, value in GLOBAL_DEFINITIONS.items():
-        if key in used_definitions:
-            relevant[key] = value
+        # Every definition is already relevant; later rules cannot change that
+        if used_definitions.issuperset(GLOBAL_DEFINITIONS):
+            break
+
+    relevant = {
+        key: value
+        for key, value in GLOBAL_DEFINITIONS.items()
+        if key in used_definitions
+    }
 
-    if not relevant:
+    # Nothing filtered out (or nothing matched): share the constant, no copy
+    if not relevant or len(relevant) == len(GLOBAL_DEFINITIONS):
         return GLOBAL_DEFINITIONS
 
     return relevant
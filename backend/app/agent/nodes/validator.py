@@ -7,13 +7,14 @@ using the RuleRegistry from the geometry module.
 from __future__ import annotations
 
 import logging
+import re
 from typing import Any, Optional
 
+from app.agent.nodes._keywords import keyword_lookahead_re
 from app.agent.state import (
     AgentState,
-    ComplianceCheck,
     ComplianceSummary,
-    add_reasoning_step,
+    new_reasoning_step,
 )
 from app.geometry.rules import RuleRegistry
 from app.geometry.types import HouseType, LandType
@@ -21,6 +22,46 @@ from app.geometry.types import HouseType, LandType
 logger = logging.getLogger(__name__)
 
 
+# Extension types in priority order, with the query keywords implying each
+EXTENSION_TYPE_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("rear", ("rear", "back")),
+    ("side", ("side", "wrap")),
+    ("loft", ("loft", "roof", "dormer")),
+    ("porch", ("porch", "front")),
+    ("outbuilding", ("outbuilding", "garage", "shed", "garden")),
+)
+
+# Storey counts in priority order, with the query keywords implying each
+STOREY_KEYWORDS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (2, ("two storey", "two-storey", "2 storey", "double storey", "multi")),
+    (1, ("single storey", "single-storey", "1 storey", "one storey")),
+)
+
+
+_KEYWORD_TO_EXTENSION_TYPE = {
+    kw: ext_type for ext_type, keywords in EXTENSION_TYPE_KEYWORDS for kw in keywords
+}
+_EXTENSION_TYPE_RE = keyword_lookahead_re(_KEYWORD_TO_EXTENSION_TYPE)
+
+_KEYWORD_TO_STOREYS = {
+    kw: storeys for storeys, keywords in STOREY_KEYWORDS for kw in keywords
+}
+_STOREYS_RE = keyword_lookahead_re(_KEYWORD_TO_STOREYS)
+
+# Designated land types that count as Article 2(3) land for rule evaluation
+ARTICLE_2_3_LAND_TYPES = frozenset({
+    "conservation_area", "national_park", "aonb", "world_heritage", "broads",
+})
+
+# Calculation types whose result is copied as-is into one evaluation context key
+_CALCULATION_CONTEXT_KEYS = {
+    "boundary_distance": "distance_to_boundary",
+    "extension_depth": "extension_depth_m",
+    "height_check": "eaves_height",
+    "width": "original_width_m",
+}
+
+
 class ValidatorNode:
     """LangGraph node that validates calculations against regulatory rules.
 
@@ -58,6 +99,8 @@ class ValidatorNode:
         "permitted development",
     ]
 
+    _COMPLIANCE_RE = re.compile("|".join(map(re.escape, COMPLIANCE_KEYWORDS)))
+
     def __init__(self):
         self.rule_registry = RuleRegistry()
 
@@ -84,8 +127,7 @@ class ValidatorNode:
             return {
                 "compliance_checks": [],
                 "compliance_summary": None,
-                "reasoning_chain": add_reasoning_step(
-                    state,
+                "reasoning_chain": new_reasoning_step(
                     "Non-compliance query - skipping rule validation",
                 ),
             }
@@ -107,27 +149,27 @@ class ValidatorNode:
                 "compliance_checks": [],
                 "compliance_summary": None,
                 "errors": state.get("errors", []) + [f"Rule evaluation failed: {e}"],
-                "reasoning_chain": add_reasoning_step(
-                    state,
+                "reasoning_chain": new_reasoning_step(
                     f"Rule evaluation error: {e}",
                 ),
             }
 
-        # Convert results to ComplianceCheck objects
-        checks = []
-        for result in evaluation.get("results", []):
-            check = ComplianceCheck(
-                rule_id=result.get("rule_id", "unknown"),
-                rule_description=result.get("rule_description", ""),
-                pdf_page=result.get("pdf_page"),
-                compliant=result.get("compliant"),
-                measured_value=result.get("measured_value"),
-                threshold=result.get("threshold"),
-                unit=result.get("unit"),
-                message=result.get("message", ""),
-                error=result.get("error"),
-            )
-            checks.append(check.model_dump())
+        # Convert results to ComplianceCheck-shaped dicts; the registry
+        # already returns typed values, so the model is not built per check
+        checks = [
+            {
+                "rule_id": result.get("rule_id", "unknown"),
+                "rule_description": result.get("rule_description", ""),
+                "pdf_page": result.get("pdf_page"),
+                "compliant": result.get("compliant"),
+                "measured_value": result.get("measured_value"),
+                "threshold": result.get("threshold"),
+                "unit": result.get("unit"),
+                "message": result.get("message", ""),
+                "error": result.get("error"),
+            }
+            for result in evaluation.get("results", [])
+        ]
 
         # Build compliance summary
         summary = ComplianceSummary(
@@ -155,13 +197,12 @@ class ValidatorNode:
         return {
             "compliance_checks": checks,
             "compliance_summary": summary.model_dump(),
-            "reasoning_chain": add_reasoning_step(state, reasoning),
+            "reasoning_chain": new_reasoning_step(reasoning),
         }
 
     def _is_compliance_question(self, query: str) -> bool:
         """Check if the query is compliance-related."""
-        query_lower = query.lower()
-        return any(kw in query_lower for kw in self.COMPLIANCE_KEYWORDS)
+        return self._COMPLIANCE_RE.search(query.lower()) is not None
 
     def _build_evaluation_context(
         self,
@@ -199,7 +240,7 @@ class ValidatorNode:
             if hasattr(land_type_str, "value"):
                 land_type_str = land_type_str.value
             # Map designated land types to LandType enum values
-            if land_type_str in ["conservation_area", "national_park", "aonb", "world_heritage", "broads"]:
+            if land_type_str in ARTICLE_2_3_LAND_TYPES:
                 context["land_type"] = LandType.ARTICLE_2_3.value
             else:
                 context["land_type"] = "standard"
@@ -210,24 +251,16 @@ class ValidatorNode:
         for calc in calculations:
             calc_type = calc.get("calculation_type", "")
 
-            if calc_type == "coverage_percentage":
+            context_key = _CALCULATION_CONTEXT_KEYS.get(calc_type)
+            if context_key is not None:
+                context[context_key] = calc.get("result", 0)
+
+            elif calc_type == "coverage_percentage":
                 context["coverage_result"] = {
                     "coverage_percent": calc.get("result", 0),
                     "compliant_50_percent": calc.get("compliant", True),
                 }
 
-            elif calc_type == "boundary_distance":
-                context["distance_to_boundary"] = calc.get("result", 0)
-
-            elif calc_type == "extension_depth":
-                context["extension_depth_m"] = calc.get("result", 0)
-
-            elif calc_type == "height_check":
-                context["eaves_height"] = calc.get("result", 0)
-
-            elif calc_type == "width":
-                context["original_width_m"] = calc.get("result", 0)
-
             elif calc_type == "max_side_extension_width":
                 if "width_result" not in context:
                     context["width_result"] = {}
@@ -269,17 +302,14 @@ class ValidatorNode:
         if explicit_type:
             return explicit_type
 
-        # Infer from query keywords
-        if any(kw in query_lower for kw in ["rear", "back"]):
-            return "rear"
-        elif any(kw in query_lower for kw in ["side", "wrap"]):
-            return "side"
-        elif any(kw in query_lower for kw in ["loft", "roof", "dormer"]):
-            return "loft"
-        elif any(kw in query_lower for kw in ["porch", "front"]):
-            return "porch"
-        elif any(kw in query_lower for kw in ["outbuilding", "garage", "shed", "garden"]):
-            return "outbuilding"
+        # Infer from query keywords, in priority order
+        matched = {
+            _KEYWORD_TO_EXTENSION_TYPE[match.group(1)]
+            for match in _EXTENSION_TYPE_RE.finditer(query_lower)
+        }
+        for ext_type, _ in EXTENSION_TYPE_KEYWORDS:
+            if ext_type in matched:
+                return ext_type
 
         # Default to rear extension (most common)
         return "rear"
@@ -293,11 +323,14 @@ class ValidatorNode:
         if explicit_storeys:
             return explicit_storeys
 
-        # Infer from query keywords
-        if any(kw in query_lower for kw in ["two storey", "two-storey", "2 storey", "double storey", "multi"]):
-            return 2
-        elif any(kw in query_lower for kw in ["single storey", "single-storey", "1 storey", "one storey"]):
-            return 1
+        # Infer from query keywords, in priority order
+        matched = {
+            _KEYWORD_TO_STOREYS[match.group(1)]
+            for match in _STOREYS_RE.finditer(query_lower)
+        }
+        for storeys, _ in STOREY_KEYWORDS:
+            if storeys in matched:
+                return storeys
 
         # Default to single storey
         return 1
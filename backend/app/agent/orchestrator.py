@@ -17,7 +17,7 @@ from app.agent.state import (
     DrawingContext,
     create_initial_state,
 )
-from app.agent.graph import get_agent_graph
+from app.agent.graph import CheckpointMode, get_agent_graph, get_durability
 from app.agent.nodes.context_loader import context_loader_node
 from app.agent.nodes.clarifier import parse_clarification_response
 
@@ -67,9 +67,12 @@ class AgentOrchestrator:
         self,
         openai_client: Optional[AsyncOpenAI] = None,
         redis_client: Optional[Redis] = None,
+        checkpoint_mode: bool | CheckpointMode = False,
     ):
         self._openai_client = openai_client
         self._redis_client = redis_client
+        self._checkpoint_mode = checkpoint_mode
+        self._durability = get_durability(checkpoint_mode)
         self._graph = None
         self._conversations: dict[str, ConversationContext] = {}
 
@@ -87,7 +90,7 @@ class AgentOrchestrator:
             except RuntimeError:
                 logger.warning("Redis not available, running without persistence")
 
-        self._graph = get_agent_graph(use_checkpointer=False)
+        self._graph = get_agent_graph(use_checkpointer=self._checkpoint_mode)
         logger.info("AgentOrchestrator initialized")
 
     async def process_query(
@@ -139,13 +142,16 @@ class AgentOrchestrator:
 
         config = {
             "configurable": {
+                "thread_id": initial_state["conversation_id"],
                 "openai_client": self._openai_client,
                 "redis_client": self._redis_client,
             }
         }
 
         try:
-            result = await self._graph.ainvoke(initial_state, config)
+            result = await self._graph.ainvoke(
+                initial_state, config, durability=self._durability
+            )
         except Exception as e:
             logger.error(f"Graph execution failed: {e}")
             return AgentResponse(
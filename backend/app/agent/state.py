@@ -4,9 +4,10 @@ Defines the complete state structure that flows through the AI agent,
 including drawing context, retrieved rules, assumptions, and clarifications.
 """
 
+import operator
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Literal, Optional, TypedDict
+from typing import Annotated, Any, Literal, Optional, TypedDict
 
 from pydantic import BaseModel, Field
 
@@ -324,6 +325,24 @@ class CalculationResult(BaseModel):
     )
 
 
+class CalculationResultDict(TypedDict):
+    """In-state shape of a calculation result.
+
+    Matches CalculationResult.model_dump(). Nodes build these as plain
+    dicts; CalculationResult validates them at the API boundary.
+    """
+
+    calculation_type: str
+    input_values: dict[str, Any]
+    result: float
+    unit: str
+    limit: Optional[float]
+    limit_source: Optional[str]
+    compliant: Optional[bool]
+    margin: Optional[float]
+    notes: Optional[str]
+
+
 class ComplianceCheck(BaseModel):
     """Result from a compliance rule check."""
 
@@ -408,6 +427,90 @@ class ConversationTurn(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+def merge_appended_list(existing: list, update: list) -> list:
+    """Reducer for append-only channels written as full lists.
+
+    Nodes return the whole list (e.g. ``state["errors"] + [...]``), so a
+    sequential update simply extends the existing value. Nodes running in
+    the same super-step each extend the same prefix; only the entries
+    past that shared prefix are appended so no branch's writes are lost.
+
+    Args:
+        existing: Current channel value
+        update: Full list returned by a node
+
+    Returns:
+        Merged list
+    """
+    if update[:len(existing)] == existing:
+        return update
+
+    shared = 0
+    for old, new in zip(existing, update):
+        if old != new:
+            break
+        shared += 1
+    return existing + update[shared:]
+
+
+def append_reasoning_steps(existing: list[str], update: list[str]) -> list[str]:
+    """Reducer for the reasoning chain, numbering steps as they are appended.
+
+    Nodes return only their new, unnumbered steps (see new_reasoning_step).
+    Branches running in the same super-step all see the chain as it was
+    before the fork, so numbers are assigned here, in merge order.
+
+    Args:
+        existing: Current numbered chain
+        update: New steps returned by a node
+
+    Returns:
+        Chain with the new steps numbered and appended
+    """
+    start = len(existing) + 1
+    return existing + [f"[{n}] {step}" for n, step in enumerate(update, start)]
+
+
+def merge_unique(existing: list, update: list) -> list:
+    """Reducer for set-like channels, keeping first-seen order.
+
+    Nodes may return either only their new entries or the full list they
+    read from state; both merge to the same value. The existing value is
+    itself reducer output and already unique, so only the update needs
+    deduplicating against it.
+
+    Args:
+        existing: Current channel value
+        update: Entries returned by a node
+
+    Returns:
+        Merged list without duplicates
+    """
+    seen = set(existing)
+    return existing + [
+        entry for entry in update
+        if not (entry in seen or seen.add(entry))
+    ]
+
+
+def merge_by_id(existing: list[dict], update: list[dict]) -> list[dict]:
+    """Reducer for record channels keyed by their "id" field.
+
+    Records in the update replace existing records with the same id in
+    place; records with unseen ids are appended.
+
+    Args:
+        existing: Current channel value
+        update: Records returned by a node
+
+    Returns:
+        Merged list of records
+    """
+    merged = {record.get("id"): record for record in existing}
+    merged.update((record.get("id"), record) for record in update)
+    return list(merged.values())
+
+
 class AgentState(TypedDict, total=False):
     """Complete state for the LangGraph agent workflow.
 
@@ -415,7 +518,9 @@ class AgentState(TypedDict, total=False):
     the full context needed for multi-turn conversations.
 
     Note: Using total=False to allow partial state updates.
-    LangGraph will merge updates into the existing state.
+    LangGraph will merge updates into the existing state. Channels that
+    parallel branches write to carry a reducer so concurrent updates merge;
+    the assumption channels carry one so nodes can return only new entries.
     """
 
     session_id: str
@@ -442,19 +547,19 @@ class AgentState(TypedDict, total=False):
     compliance_checks: list[dict]  # Results from validator node rule checks
     compliance_summary: Optional[dict]  # Summary of compliance evaluation
 
-    assumptions: list[dict]
-    missing_info: list[str]
-    clarification_questions: list[dict]
+    assumptions: Annotated[list[dict], operator.add]
+    missing_info: Annotated[list[str], merge_unique]
+    clarification_questions: Annotated[list[dict], merge_by_id]
     awaiting_clarification: bool
 
-    reasoning_chain: list[str]
+    reasoning_chain: Annotated[list[str], append_reasoning_steps]
     confidence: str
 
     final_answer: Optional[str]
-    caveats: list[str]
+    caveats: Annotated[list[str], merge_unique]
     suggested_followups: list[str]
 
-    errors: list[str]
+    errors: Annotated[list[str], merge_appended_list]
     should_escalate: bool
 
 
@@ -527,19 +632,19 @@ def create_initial_state(
     )
 
 
-def add_reasoning_step(state: AgentState, step: str) -> list[str]:
-    """Add a reasoning step to the chain.
+def new_reasoning_step(step: str) -> list[str]:
+    """Create a reasoning step to append to the chain.
+
+    The step is left unnumbered; the reasoning_chain reducer numbers it
+    when it is appended, so parallel branches never reuse a number.
 
     Args:
-        state: Current agent state
         step: Description of the reasoning step
 
     Returns:
-        Updated reasoning chain list
+        Single-entry list holding the step
     """
-    chain = list(state.get("reasoning_chain", []))
-    chain.append(f"[{len(chain) + 1}] {step}")
-    return chain
+    return [step]
 
 
 def get_drawing_context(state: AgentState) -> Optional[DrawingContext]:
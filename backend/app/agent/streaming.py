@@ -127,22 +127,46 @@ class StreamingOrchestrator(AgentOrchestrator):
 
         config = {
             "configurable": {
+                "thread_id": initial_state["conversation_id"],
                 "openai_client": self._openai_client,
                 "redis_client": self._redis_client,
+                "stream_tokens": True,
             }
         }
 
         step_index = 0
+        token_index = 0
         final_state = None
+        step_nodes: list[str] = []
 
         try:
-            async for chunk in self._graph.astream(initial_state, config, stream_mode="values"):
-                step_index += 1
-                final_state = chunk
+            async for mode, chunk in self._graph.astream(
+                initial_state,
+                config,
+                stream_mode=["values", "updates", "custom"],
+                durability=self._durability,
+            ):
+                if mode == "custom":
+                    yield StreamEvent(
+                        event_type=StreamEventType.TOKEN,
+                        node=chunk.get("node"),
+                        data={"chunk": chunk.get("chunk", ""), "token_index": token_index},
+                    )
+                    token_index += 1
+                    continue
 
-                node_name = self._detect_current_node(chunk, step_index)
+                if mode == "updates":
+                    # One chunk per node, emitted before the super-step's values
+                    step_nodes.extend(self._detect_current_nodes(chunk))
+                    continue
 
-                if node_name:
+                final_state = chunk
+                if not step_nodes:
+                    # Input state, before any node has run
+                    continue
+
+                step_index += 1
+                for node_name in step_nodes:
                     yield StreamEvent(
                         event_type=StreamEventType.NODE_START,
                         node=node_name,
@@ -151,6 +175,7 @@ class StreamingOrchestrator(AgentOrchestrator):
                             "message": NODE_DESCRIPTIONS.get(node_name, f"Processing {node_name}..."),
                         },
                     )
+                step_nodes = []
 
                 if chunk.get("awaiting_clarification"):
                     questions = chunk.get("clarification_questions", [])
@@ -258,35 +283,13 @@ class StreamingOrchestrator(AgentOrchestrator):
         ):
             yield event
 
-    def _detect_current_node(self, state: AgentState, step_index: int) -> Optional[str]:
-        """Detect which node just completed based on state changes."""
-        if step_index == 1:
-            return "classifier"
-
-        query_type = state.get("query_type")
-        has_context = state.get("drawing_context") is not None
-        has_rules = bool(state.get("retrieved_rules"))
-        has_assumptions = state.get("assumptions") is not None
-        awaiting = state.get("awaiting_clarification", False)
-        has_calcs = bool(state.get("calculation_results"))
-        has_answer = bool(state.get("final_answer"))
-
-        if has_context and not has_rules and step_index <= 3:
-            return "context_loader"
-        elif has_rules and not has_assumptions:
-            return "retriever"
-        elif has_assumptions is not None and not awaiting and not has_calcs and not has_answer:
-            return "assumption_analyzer"
-        elif awaiting:
-            return "clarifier"
-        elif has_calcs and not has_answer:
-            return "calculator"
-        elif has_answer and state.get("formatted", False):
-            return "response_formatter"
-        elif has_answer:
-            return "reasoner"
-
-        return None
+    def _detect_current_nodes(self, update: dict[str, Any]) -> list[str]:
+        """Return the nodes that wrote an "updates" stream chunk.
+
+        Parallel branches (context_loader and retriever) finish in the same
+        super-step, so one step can report more than one node.
+        """
+        return [name for name in update if not name.startswith("__")]
 
     def _build_complete_response(
         self,
@@ -292,6 +292,14 @@ async def handle_query(
                 )
                 await manager.send_message(connection_id, step_msg.model_dump())
 
+            elif event.event_type == StreamEventType.TOKEN:
+                token_msg = ServerMessage.token(
+                    chunk=event.data.get("chunk", ""),
+                    node=event.node or "unknown",
+                    token_index=event.data.get("token_index", 0),
+                )
+                await manager.send_message(connection_id, token_msg.model_dump())
+
             elif event.event_type == StreamEventType.CLARIFICATION_REQUEST:
                 clarify_payload = ClarificationRequestPayload(
                     id=event.data.get("id", ""),
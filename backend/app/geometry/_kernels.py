@@ -0,0 +1,42 @@
+"""Numeric kernels for hot geometry calculations.
+
+Kernels take raw float64 coordinate arrays rather than Shapely objects.
+When Numba is installed they are JIT-compiled to native loops; otherwise
+they fall back to equivalent vectorized NumPy code.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _shoelace_area_loop(xs: np.ndarray, ys: np.ndarray) -> float:
+    """Calculate the area of a closed ring with the shoelace formula.
+
+    Args:
+        xs: X coordinates, with the first point repeated at the end
+        ys: Y coordinates, with the first point repeated at the end
+
+    Returns:
+        Unsigned area in the square of the coordinate unit
+    """
+    total = 0.0
+    for i in range(xs.shape[0] - 1):
+        total += xs[i] * ys[i + 1] - xs[i + 1] * ys[i]
+    return abs(total) * 0.5
+
+
+def _shoelace_area_numpy(xs: np.ndarray, ys: np.ndarray) -> float:
+    """Vectorized equivalent of _shoelace_area_loop for when Numba is absent."""
+    return float(abs(np.dot(xs[:-1], ys[1:]) - np.dot(xs[1:], ys[:-1])) * 0.5)
+
+
+if njit is not None:
+    shoelace_area = njit(cache=True)(_shoelace_area_loop)
+    # Compile at import so the first request does not pay for it
+    shoelace_area(np.zeros(4), np.zeros(4))
+else:
+    shoelace_area = _shoelace_area_numpy
@@ -1,11 +1,41 @@
-"""Session repository for Redis operations."""
+"""Session repository for Redis operations.
 
+Metadata updates use SET with KEEPTTL, which requires Redis 6.0 or later.
+"""
+
+import asyncio
 import json
+import logging
 import uuid
 from datetime import datetime, timezone
 from typing import Any
 
 from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+UPDATE_META_MAX_ATTEMPTS = 5
+UPDATE_META_RETRY_DELAY_SECONDS = 0.01
+
+
+def _json_loads(data: str | bytes) -> Any:
+    """Decode a stored JSON value, using orjson when it is installed.
+
+    Values are written with json.dumps, which allows NaN and Infinity;
+    orjson rejects those, so such values fall back to json.loads.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 class SessionRepository:
@@ -55,32 +85,65 @@ class SessionRepository:
         data = await self.redis.get(self._meta_key(session_id))
         if data is None:
             return None
-        return json.loads(data)
+        return _json_loads(data)
 
     async def update_meta(self, session_id: str, **updates: Any) -> bool:
-        """Update session metadata fields. Returns False if session not found."""
-        meta = await self.get_meta(session_id)
-        if meta is None:
-            return False
-
-        meta.update(updates)
-        meta["updated_at"] = datetime.now(timezone.utc).isoformat()
+        """
+        Update session metadata fields, keeping the key's TTL.
+        Retries if the metadata changes between the read and the write.
+        Returns False if the session is not found or every attempt conflicts.
+        """
+        meta_key = self._meta_key(session_id)
 
-        ttl = await self.redis.ttl(self._meta_key(session_id))
-        if ttl > 0:
-            await self.redis.set(
-                self._meta_key(session_id),
-                json.dumps(meta),
-                ex=ttl,
-            )
-        return True
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for attempt in range(1, UPDATE_META_MAX_ATTEMPTS + 1):
+                try:
+                    await pipe.watch(meta_key)
+                    data = await pipe.get(meta_key)
+                    if data is None:
+                        return False
+
+                    meta = _json_loads(data)
+                    meta.update(updates)
+                    meta["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+                    pipe.multi()
+                    pipe.set(meta_key, json.dumps(meta), keepttl=True)
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    if attempt < UPDATE_META_MAX_ATTEMPTS:
+                        await asyncio.sleep(UPDATE_META_RETRY_DELAY_SECONDS * attempt)
+
+        logger.warning(
+            "Gave up updating metadata for session %s after %d conflicting writes",
+            session_id,
+            UPDATE_META_MAX_ATTEMPTS,
+        )
+        return False
 
     async def get_context(self, session_id: str) -> dict[str, Any] | None:
         """Get drawing context. Returns None if not found."""
         data = await self.redis.get(self._context_key(session_id))
         if data is None:
             return None
-        return json.loads(data)
+        return _json_loads(data)
+
+    async def get_meta_and_context(
+        self,
+        session_id: str,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """
+        Get session metadata and drawing context in one round trip.
+        Returns (meta, context) with None for whichever is missing.
+        """
+        meta_data, context_data = await self.redis.mget(
+            self._meta_key(session_id),
+            self._context_key(session_id),
+        )
+        meta = _json_loads(meta_data) if meta_data is not None else None
+        context = _json_loads(context_data) if context_data is not None else None
+        return meta, context
 
     async def set_context(
         self,
@@ -173,9 +236,8 @@ class SessionRepository:
         expired_ids = []
 
         for session_id in session_ids:
-            meta = await self.get_meta(session_id)
+            meta, context = await self.get_meta_and_context(session_id)
             if meta is not None:
-                context = await self.get_context(session_id)
                 meta["has_context"] = context is not None
                 meta["object_count"] = 0
                 if context and "objects" in context:
@@ -246,7 +308,7 @@ class SessionRepository:
         messages = []
         for item in data:
             try:
-                messages.append(json.loads(item))
+                messages.append(_json_loads(item))
             except json.JSONDecodeError:
                 continue
 
@@ -166,8 +166,10 @@ class ContextAssembler:
         final_tokens = self.count_tokens(full_text)
 
         logger.debug(
-            f"Assembled context: {primary_count} primary, {xref_count} xref, "
-            f"{final_tokens} tokens"
+            "Assembled context: %d primary, %d xref, %d tokens",
+            primary_count,
+            xref_count,
+            final_tokens,
         )
 
         return AssembledContext(
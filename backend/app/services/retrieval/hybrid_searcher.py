@@ -100,10 +100,12 @@ class HybridSearcher:
         matched = self._compute_rrf(vector_results, bm25_results, rrf_k)
 
         logger.debug(
-            f"Hybrid search: {len(queries)} queries, "
-            f"{len(vector_results)} vector hits, "
-            f"{len(bm25_results)} BM25 hits, "
-            f"{len(matched)} combined results"
+            "Hybrid search: %d queries, %d vector hits, %d BM25 hits, "
+            "%d combined results",
+            len(queries),
+            len(vector_results),
+            len(bm25_results),
+            len(matched),
         )
 
         return matched
@@ -104,7 +104,7 @@ class ParentRanker:
         result = ranked[:top_n]
 
         logger.debug(
-            f"Ranked {len(parent_groups)} parents, returning top {len(result)}"
+            "Ranked %d parents, returning top %d", len(parent_groups), len(result)
         )
 
         return result
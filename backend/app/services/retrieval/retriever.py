@@ -1,5 +1,6 @@
 """Main retrieval service orchestrating the full retrieval pipeline."""
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from typing import Optional
@@ -137,7 +138,7 @@ class RetrieverService:
         if do_expand:
             try:
                 query_variations = await self._query_expander.expand(query)
-                logger.debug(f"Generated {len(query_variations)} query variations")
+                logger.debug("Generated %d query variations", len(query_variations))
             except Exception as e:
                 logger.warning(f"Query expansion failed, using original: {e}")
                 query_variations = [query]
@@ -149,7 +150,7 @@ class RetrieverService:
                 queries=query_variations,
                 top_k_per_query=top_k_per_query,
             )
-            logger.debug(f"Hybrid search returned {len(matched_children)} children")
+            logger.debug("Hybrid search returned %d children", len(matched_children))
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
             raise RetrievalError(f"Search failed: {e}")
@@ -171,7 +172,7 @@ class RetrieverService:
             matched_children=matched_children,
             top_n=top_n_parents,
         )
-        logger.debug(f"Ranked {len(ranked_parents)} parents")
+        logger.debug("Ranked %d parents", len(ranked_parents))
 
         if not ranked_parents:
             logger.info("No parents found after ranking")
@@ -189,7 +190,7 @@ class RetrieverService:
         if do_xrefs:
             try:
                 enhanced_parents = await self._xref_resolver.resolve(ranked_parents)
-                logger.debug(f"Resolved xrefs: {len(enhanced_parents)} enhanced parents")
+                logger.debug("Resolved xrefs: %d enhanced parents", len(enhanced_parents))
             except Exception as e:
                 logger.warning(f"XRef resolution failed, continuing without: {e}")
                 enhanced_parents = await self._xref_resolver._convert_without_xrefs(
@@ -288,6 +289,7 @@ class RetrieverService:
 
 
 _retriever_service: Optional[RetrieverService] = None
+_retriever_service_lock = asyncio.Lock()
 
 
 async def get_retriever_service(
@@ -305,13 +307,20 @@ async def get_retriever_service(
     """
     global _retriever_service
 
-    if _retriever_service is None:
-        if infrastructure is None:
-            from app.services.indexing.infrastructure import get_indexing_infrastructure
-            infrastructure = await get_indexing_infrastructure()
+    if _retriever_service is not None:
+        return _retriever_service
 
-        _retriever_service = RetrieverService(infrastructure)
-        await _retriever_service.initialize()
+    # Concurrent first callers wait for one initialization instead of each
+    # building a service; it is published only once fully initialized
+    async with _retriever_service_lock:
+        if _retriever_service is None:
+            if infrastructure is None:
+                from app.services.indexing.infrastructure import get_indexing_infrastructure
+                infrastructure = await get_indexing_infrastructure()
+
+            service = RetrieverService(infrastructure)
+            await service.initialize()
+            _retriever_service = service
 
     return _retriever_service
 
@@ -115,8 +115,9 @@ class XRefResolver:
         result = enhanced + xref_parents
 
         logger.debug(
-            f"Resolved xrefs: {len(enhanced)} primary parents, "
-            f"{len(xref_parents)} xref parents"
+            "Resolved xrefs: %d primary parents, %d xref parents",
+            len(enhanced),
+            len(xref_parents),
         )
 
         return result
@@ -22,6 +22,18 @@ from app.agent.state import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_llm_response_caches():
+    """Keep cached LLM outputs, retrievals and measurements from leaking between tests."""
+    from app.agent.nodes import clarifier, classifier, context_loader, retriever
+
+    classifier._decision_cache.clear()
+    clarifier._message_cache.clear()
+    context_loader._measurement_cache.clear()
+    retriever._retrieval_cache.clear()
+    yield
+
+
 @pytest.fixture
 def sample_drawing_context() -> DrawingContext:
     """Drawing context with typical measurements."""
@@ -190,9 +202,8 @@ def mock_openai_client():
         messages = kwargs.get("messages", [])
         user_content = ""
         for msg in messages:
-            if msg.get("role") == "user":
-                user_content = msg.get("content", "")
-                break
+            if msg.get("role") in ("system", "user"):
+                user_content += msg.get("content", "")
 
         if "classify" in user_content.lower() or "categories" in user_content.lower():
             response_content = json.dumps({
@@ -323,7 +334,11 @@ def mock_redis_client():
         if key in storage:
             del storage[key]
 
+    async def mock_mget(*keys):
+        return [storage.get(key) for key in keys]
+
     client.get = mock_get
+    client.mget = mock_mget
     client.set = mock_set
     client.delete = mock_delete
 
@@ -378,8 +393,12 @@ def mock_session_with_drawing(sample_drawing_context):
             },
         }
 
+    async def mock_get_meta_and_context(session_id):
+        return await mock_get_meta(session_id), await mock_get_context(session_id)
+
     repo.get_meta = mock_get_meta
     repo.get_context = mock_get_context
+    repo.get_meta_and_context = mock_get_meta_and_context
 
     return repo
 
@@ -401,7 +420,11 @@ def mock_session_empty():
     async def mock_get_context(session_id):
         return None
 
+    async def mock_get_meta_and_context(session_id):
+        return await mock_get_meta(session_id), await mock_get_context(session_id)
+
     repo.get_meta = mock_get_meta
     repo.get_context = mock_get_context
+    repo.get_meta_and_context = mock_get_meta_and_context
 
     return repo
@@ -12,8 +12,14 @@ from app.agent.state import (
     QueryType,
     create_initial_state,
 )
-from app.agent.graph import create_agent_graph, reset_agent_graph
+from app.agent.graph import (
+    create_agent_graph,
+    get_agent_graph,
+    get_durability,
+    reset_agent_graph,
+)
 from app.agent.orchestrator import AgentOrchestrator
+from app.agent.streaming import StreamEventType, StreamingOrchestrator
 
 
 @pytest.fixture(autouse=True)
@@ -24,6 +30,70 @@ def reset_graph():
     reset_agent_graph()
 
 
+class TestGraphCache:
+    """Test the compiled graph cache."""
+
+    def test_caches_graph_per_checkpointer_mode(self):
+        """Each checkpointing mode should get its own cached graph."""
+        plain = get_agent_graph(use_checkpointer=False)
+        checkpointed = get_agent_graph(use_checkpointer=True)
+
+        assert plain is not checkpointed
+        assert plain.checkpointer is None
+        assert checkpointed.checkpointer is not None
+        assert get_agent_graph(use_checkpointer=False) is plain
+        assert get_agent_graph(use_checkpointer=True) is checkpointed
+
+    def test_graphs_are_compiled_state_graphs(self):
+        """Every checkpointing mode should return a plain compiled graph."""
+        from langgraph.graph.state import CompiledStateGraph
+
+        for mode in (False, "per_node", "end_of_workflow"):
+            assert isinstance(get_agent_graph(use_checkpointer=mode), CompiledStateGraph)
+
+    @pytest.mark.asyncio
+    async def test_end_of_workflow_checkpointing_saves_once(self):
+        """End-of-workflow durability should persist only the final state."""
+        graph = create_agent_graph(use_checkpointer="end_of_workflow")
+        config = {"configurable": {"thread_id": "test-thread"}}
+
+        initial_state = create_initial_state(
+            session_id="test-session",
+            user_query="What is permitted development?",
+        )
+
+        await graph.ainvoke(
+            initial_state, config, durability=get_durability("end_of_workflow")
+        )
+
+        assert len(list(graph.checkpointer.list(config))) == 1
+        assert graph.get_state(config).values["final_answer"] is not None
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_runs_with_checkpoint_mode_durability(self):
+        """The orchestrator should pass its mode's durability to the graph."""
+        orchestrator = AgentOrchestrator(
+            openai_client=None,
+            redis_client=None,
+            checkpoint_mode="end_of_workflow",
+        )
+
+        with patch("app.agent.orchestrator.get_settings") as mock_settings:
+            mock_settings.return_value.openai_api_key = None
+            await orchestrator.initialize()
+
+            response = await orchestrator.process_query(
+                session_id="test-session",
+                query="What is permitted development?",
+                conversation_id="conv-1",
+            )
+
+        graph = get_agent_graph(use_checkpointer="end_of_workflow")
+        config = {"configurable": {"thread_id": "conv-1"}}
+        assert response.answer is not None
+        assert len(list(graph.checkpointer.list(config))) == 1
+
+
 class TestGeneralQueryFlow:
     """Test the general query path: classifier → reasoner → formatter → END."""
 
@@ -65,6 +135,64 @@ class TestLegalSearchFlow:
         ]
         assert result["final_answer"] is not None
 
+    @pytest.mark.asyncio
+    async def test_context_loader_and_retriever_run_in_parallel(self):
+        """Both branches should run and their updates should be merged."""
+        graph = create_agent_graph(use_checkpointer=False)
+
+        initial_state = create_initial_state(
+            session_id="test-session",
+            user_query="What is the maximum height for extensions?",
+        )
+
+        with patch(
+            "app.infrastructure.redis.get_redis",
+            side_effect=RuntimeError("Redis not initialized"),
+        ), patch(
+            "app.services.retrieval.retriever.get_retriever_service",
+            side_effect=RuntimeError("index missing"),
+        ):
+            result = await graph.ainvoke(initial_state, {})
+
+        assert "Redis connection unavailable" in result["errors"]
+        assert any(e.startswith("Retriever unavailable") for e in result["errors"])
+        assert any("Redis unavailable" in s for s in result["reasoning_chain"])
+        assert any("Retriever service unavailable" in s for s in result["reasoning_chain"])
+
+        assert all(
+            step.startswith(f"[{n}] ")
+            for n, step in enumerate(result["reasoning_chain"], 1)
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_retrieval_is_retried_on_next_run(self):
+        """A transient retriever failure must not be served again on the next run."""
+        graph = create_agent_graph(use_checkpointer=False)
+
+        retriever_service = MagicMock()
+        retriever_service.retrieve = AsyncMock(
+            return_value=MagicMock(enhanced_parents=[])
+        )
+        get_service = AsyncMock(
+            side_effect=[RuntimeError("qdrant down"), retriever_service]
+        )
+
+        results = []
+        with patch("app.services.retrieval.retriever.get_retriever_service", get_service):
+            for _ in range(2):
+                results.append(await graph.ainvoke(
+                    create_initial_state(
+                        session_id="test-session",
+                        user_query="What is the maximum height for extensions?",
+                    ),
+                    {},
+                ))
+
+        assert any("qdrant down" in e for e in results[0]["errors"])
+        assert not any("qdrant down" in e for e in results[1]["errors"])
+        assert get_service.await_count == 2
+        assert retriever_service.retrieve.await_count == 1
+
 
 class TestComplianceCheckWithDrawing:
     """Test compliance check with drawing uploaded."""
@@ -246,6 +374,41 @@ class TestOrchestratorIntegration:
         assert response.answer is not None
         assert response.query_type is not None
 
+    @pytest.mark.asyncio
+    async def test_streaming_reports_parallel_nodes_in_one_step(self):
+        """Both parallel branches should be reported for the same step."""
+        orchestrator = StreamingOrchestrator(
+            openai_client=None,
+            redis_client=None,
+        )
+
+        with patch("app.agent.orchestrator.get_settings") as mock_settings, patch(
+            "app.infrastructure.redis.get_redis",
+            side_effect=RuntimeError("Redis not initialized"),
+        ), patch(
+            "app.services.retrieval.retriever.get_retriever_service",
+            side_effect=RuntimeError("index missing"),
+        ):
+            mock_settings.return_value.openai_api_key = None
+            await orchestrator.initialize()
+
+            events = [
+                event
+                async for event in orchestrator.process_query_streaming(
+                    session_id="test-session",
+                    query="What is the maximum height for extensions?",
+                )
+            ]
+
+        steps = [
+            (event.data["step_index"], event.node)
+            for event in events
+            if event.event_type == StreamEventType.NODE_START
+        ]
+        assert steps[0] == (1, "classifier")
+        assert sorted(steps[1:3]) == [(2, "context_loader"), (2, "retriever")]
+        assert steps[3] == (3, "assumption_analyzer")
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
@@ -1,6 +1,8 @@
 """Integration tests for Calculator Node (Phase 5.4)."""
 
+import json
 import pytest
+from unittest.mock import patch
 
 from app.agent.nodes.calculator import CalculatorNode, calculator_node
 from app.agent.state import (
@@ -101,6 +103,32 @@ class TestCalculatorWithRawDrawingObjects:
         assert parsed["plot_boundary"] is not None
         assert len(parsed["highways"]) == 1
 
+    def test_reuses_analysis_for_unchanged_drawing(
+        self, calculator, sample_drawing_objects, sample_drawing_context
+    ):
+        """Repeat calculations on the same drawing should not re-parse it."""
+        state = create_initial_state(
+            session_id="test",
+            user_query="What is my coverage?",
+            raw_drawing_objects=sample_drawing_objects,
+        )
+        state["drawing_context"] = sample_drawing_context
+
+        with patch.object(
+            calculator.drawing_parser,
+            "parse",
+            wraps=calculator.drawing_parser.parse,
+        ) as parse:
+            first = calculator.calculate(state)
+            second = calculator.calculate(state)
+
+            state["drawing_context"] = {**sample_drawing_context, "house_type": "detached"}
+            calculator.calculate(state)
+
+        assert parse.call_count == 2
+        assert second["calculation_results"] == first["calculation_results"]
+        assert second["spatial_analysis"] == first["spatial_analysis"]
+
     def test_calculates_areas_from_geometry(
         self, calculator, sample_drawing_objects, sample_drawing_context
     ):
@@ -188,6 +216,58 @@ class TestCalculatorWithRawDrawingObjects:
         assert coverage_calc["limit"] == 50.0
         assert coverage_calc["limit_source"] == "Class A.1(b) - 50% curtilage rule"
 
+    def test_result_dicts_match_schema(
+        self, calculator, sample_drawing_objects, sample_drawing_context
+    ):
+        """Result dicts built directly should match the Pydantic schema."""
+        state = create_initial_state(
+            session_id="test",
+            user_query="How far is my building from the boundary, and what is my coverage?",
+            raw_drawing_objects=sample_drawing_objects,
+        )
+        state["drawing_context"] = sample_drawing_context
+        state["pending_calculations"] = ["height_check"]
+
+        calc_results = calculator.calculate(state)["calculation_results"]
+
+        assert calc_results
+        for calc in calc_results:
+            assert CalculationResult.model_validate(calc).model_dump() == calc
+
+    def test_concurrent_branches_keep_result_order(
+        self, calculator, sample_drawing_objects, sample_drawing_context
+    ):
+        """Geometry branches run concurrently but results keep branch order."""
+        state = create_initial_state(
+            session_id="test",
+            user_query="How far is my building from the boundary, and what is my coverage?",
+            raw_drawing_objects=sample_drawing_objects,
+        )
+        state["drawing_context"] = sample_drawing_context
+
+        calc_types = [
+            c["calculation_type"]
+            for c in calculator.calculate(state)["calculation_results"]
+        ]
+
+        assert calc_types == ["area", "area", "coverage_percentage", "boundary_distance"]
+
+    def test_results_hold_only_builtin_json_types(
+        self, calculator, sample_drawing_objects, sample_drawing_context
+    ):
+        """No NumPy scalars should leak out of the geometry path into state."""
+        state = create_initial_state(
+            session_id="test",
+            user_query="How far is my building from the boundary, and what is my coverage?",
+            raw_drawing_objects=sample_drawing_objects,
+        )
+        state["drawing_context"] = sample_drawing_context
+
+        result = calculator.calculate(state)
+
+        json.dumps(result["calculation_results"])
+        json.dumps(result["spatial_analysis"])
+
 
 class TestCalculatorWithDrawingContext:
     """Test calculator with pre-calculated drawing context (fallback path)."""
@@ -272,6 +352,24 @@ class TestCalculatorEdgeCases:
         assert result["calculation_results"] == []
         assert "No drawing context" in result["reasoning_chain"][-1]
 
+    def test_skips_drawing_analysis_when_nothing_requested(
+        self, calculator, sample_drawing_objects, sample_drawing_context
+    ):
+        """Calculator should not parse the drawing when no calculation is needed."""
+        state = create_initial_state(
+            session_id="test",
+            user_query="Do I need planning permission?",
+            raw_drawing_objects=sample_drawing_objects,
+        )
+        state["drawing_context"] = sample_drawing_context
+
+        with patch.object(calculator.drawing_parser, "parse") as parse:
+            result = calculator.calculate(state)
+
+        parse.assert_not_called()
+        assert result["calculation_results"] == []
+        assert result["spatial_analysis"] is None
+
     def test_handles_empty_drawing_objects(self, calculator, sample_drawing_context):
         """Calculator should fall back to context when no raw objects."""
         state = create_initial_state(
@@ -348,6 +446,22 @@ class TestCalculatorEdgeCases:
 
         assert result["should_escalate"] is True
 
+    def test_reports_each_out_of_range_field(self):
+        """Validation should report every out-of-range field and skip missing ones."""
+        from app.agent.nodes.calculator import _validate_geometry
+
+        errors = _validate_geometry({
+            "plot_area_sqm": 5.0,
+            "building_height_m": 50,
+            "eaves_height_m": None,
+            "distance_to_boundary_m": 3.0,
+        })
+
+        assert errors == [
+            "Unusual plot area sqm: 5.0. Expected range: 10.0-10000.0.",
+            "Unusual building height m: 50. Expected range: 1.0-20.0.",
+        ]
+
 
 class TestCalculatorNodeQueryDetection:
     """Test query keyword detection."""
@@ -381,6 +495,16 @@ class TestCalculatorNodeQueryDetection:
         assert calculator._needs_extension("extend beyond wall")
         assert not calculator._needs_extension("plot boundary")
 
+    def test_matches_all_categories_in_one_scan(self):
+        """Keyword matcher should report every category present in the query."""
+        from app.agent.nodes.calculator import _match_calculation_keywords
+
+        assert _match_calculation_keywords(
+            "how far does my rear extension project, and is the eaves height ok?"
+        ) == {"distance", "extension", "height"}
+        assert _match_calculation_keywords("side extension width") == {"extension", "width"}
+        assert _match_calculation_keywords("hello") == set()
+
 
 class TestAsyncCalculatorNode:
     """Test the async calculator_node function."""
@@ -77,6 +77,180 @@ class TestClassifierNode:
         ]
 
 
+    @pytest.mark.asyncio
+    async def test_reuses_cached_decision_for_repeated_query(self):
+        """Repeats of a query differing only in case or spacing skip the LLM."""
+        from app.agent.nodes.classifier import classifier_node
+
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = '{"query_type": "LEGAL_SEARCH", "intent": "height limit"}'
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        with patch("app.agent.nodes.classifier.get_settings") as mock_settings:
+            mock_settings.return_value.agent_classifier_model = "gpt-4"
+
+            first = await classifier_node(
+                create_initial_state(session_id="test", user_query="Max height for a shed?"),
+                openai_client=mock_client,
+            )
+            second = await classifier_node(
+                create_initial_state(session_id="test", user_query="  max height for a shed? "),
+                openai_client=mock_client,
+            )
+
+        assert first["query_type"] == second["query_type"] == QueryType.LEGAL_SEARCH.value
+        assert second["query_intent"] == "height limit"
+        assert mock_client.chat.completions.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_share_one_llm_call(self):
+        """Identical queries in flight together should issue a single request."""
+        import asyncio
+
+        from app.agent.nodes.classifier import classifier_node
+
+        release = asyncio.Event()
+
+        async def slow_create(**kwargs):
+            await release.wait()
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = '{"query_type": "GENERAL", "intent": "explain"}'
+            return response
+
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+
+        with patch("app.agent.nodes.classifier.get_settings") as mock_settings:
+            mock_settings.return_value.agent_classifier_model = "gpt-4"
+
+            tasks = [
+                asyncio.create_task(
+                    classifier_node(
+                        create_initial_state(session_id=f"s{i}", user_query="What is a curtilage?"),
+                        openai_client=mock_client,
+                    )
+                )
+                for i in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+
+        assert [r["query_type"] for r in results] == [QueryType.GENERAL.value] * 3
+        assert mock_client.chat.completions.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_single_flight_shares_failures_with_joined_callers(self):
+        """Callers joining a failing call should see the same error."""
+        import asyncio
+
+        from app.agent.nodes._single_flight import SingleFlight
+
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def failing_call():
+            await release.wait()
+            raise ConnectionError("upstream down")
+
+        tasks = [
+            asyncio.create_task(flight.run("key", failing_call)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(o, ConnectionError) for o in outcomes)
+        assert await flight.run("key", lambda: asyncio.sleep(0, result="fresh")) == (
+            "fresh",
+            False,
+        )
+
+    def test_ttl_cache_evicts_least_recent_and_expires(self):
+        """The shared cache should drop the LRU entry and expired entries."""
+        from app.agent.nodes._ttl_cache import TTLCache
+
+        cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+        with patch("app.agent.nodes._ttl_cache.time.monotonic", return_value=0.0):
+            cache.set("a", 1)
+            cache.set("b", 2)
+            assert cache.get("a") == 1
+            cache.set("c", 3)
+
+            assert cache.get("b") is None
+            assert cache.get("a") == 1
+
+        with patch("app.agent.nodes._ttl_cache.time.monotonic", return_value=61.0):
+            assert cache.get("a") is None
+            assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_greeting_skips_llm(self):
+        """Greetings should be classified locally as GENERAL."""
+        from app.agent.nodes.classifier import classifier_node
+
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock()
+
+        result = await classifier_node(
+            create_initial_state(session_id="test", user_query="Hello there"),
+            openai_client=mock_client,
+        )
+
+        assert result["query_type"] == QueryType.GENERAL.value
+        mock_client.chat.completions.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query", [
+        "hi, can I build a rear extension?",
+        "hi can I build a 4m rear extension",
+        "hey what about my loft",
+        "good morning is my extension compliant",
+    ])
+    async def test_greeting_with_planning_question_calls_llm(self, query):
+        """A greeting opener must not hide a planning question from the LLM."""
+        from app.agent.nodes.classifier import classifier_node, is_greeting_query
+
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock()
+
+        await classifier_node(
+            create_initial_state(session_id="test", user_query=query),
+            openai_client=mock_client,
+        )
+
+        assert not is_greeting_query(query)
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    def test_keyword_fallback_priority(self):
+        """Keyword buckets found in one scan should keep their priority order."""
+        from app.agent.nodes.classifier import _keyword_classify
+
+        assert _keyword_classify("What is permitted development?", True)[0] == QueryType.GENERAL
+        assert _keyword_classify("What is the max height?", True)[0] == QueryType.LEGAL_SEARCH
+        assert _keyword_classify("Is my extension compliant? Calculate coverage", True)[0] == QueryType.CALCULATION
+        assert _keyword_classify("Is my extension compliant?", True)[0] == QueryType.COMPLIANCE_CHECK
+        assert _keyword_classify("Is my extension compliant?", False)[0] == QueryType.LEGAL_SEARCH
+
+    def test_parses_first_json_object_in_response(self):
+        """Fenced, embedded and brace-containing JSON should all parse."""
+        from app.agent.nodes.classifier import _parse_llm_response
+
+        assert _parse_llm_response('```json\n{"query_type": "GENERAL"}\n```') == {
+            "query_type": "GENERAL"
+        }
+        assert _parse_llm_response('Here you go: {"intent": "a {b} c"} Thanks!') == {
+            "intent": "a {b} c"
+        }
+        assert _parse_llm_response("{not json} then {\"query_type\": \"CALCULATION\"}") == {
+            "query_type": "CALCULATION"
+        }
+        assert _parse_llm_response("GENERAL") is None
+
+
 class TestClarificationRouterNode:
     """Tests for clarification_router_node."""
 
@@ -157,6 +331,58 @@ class TestClarificationRouterNode:
         assert result["awaiting_clarification"] is False
         assert result["pending_calculations"] == []
 
+    @pytest.mark.asyncio
+    async def test_query_and_rule_text_do_not_run_together(
+        self, sample_drawing_context
+    ):
+        """A query ending in '2' next to a rule starting with 'm' is not '2m'."""
+        from app.agent.nodes.clarification_router import clarification_router_node
+
+        state: AgentState = {
+            "session_id": "test",
+            "user_query": "Check my extension for plot 2",
+            "query_type": QueryType.COMPLIANCE_CHECK.value,
+            "missing_info": [],
+            "clarification_questions": [],
+            "drawing_context": sample_drawing_context.model_dump(),
+            "retrieved_rules": [
+                {"text": "must not exceed 50% of the curtilage", "section": "A.1(b)"}
+            ],
+            "reasoning_chain": [],
+        }
+
+        result = await clarification_router_node(state)
+
+        assert result["pending_calculations"] == ["coverage_percentage"]
+
+    @pytest.mark.asyncio
+    async def test_returns_reasoning_step_delta(self):
+        """Router should emit only its own step, merged by the chain reducer."""
+        from app.agent.nodes.clarification_router import clarification_router_node
+        from app.agent.state import append_reasoning_steps
+
+        chain = ["[1] Classified as general", "[2] Retrieved 0 rules"]
+        state: AgentState = {
+            "session_id": "test",
+            "user_query": "What is permitted development?",
+            "query_type": QueryType.GENERAL.value,
+            "missing_info": [],
+            "clarification_questions": [],
+            "drawing_context": None,
+            "retrieved_rules": [],
+            "reasoning_chain": chain,
+        }
+
+        result = await clarification_router_node(state)
+
+        assert result["reasoning_chain"] == [
+            "No calculations needed, proceeding to reasoning"
+        ]
+        assert append_reasoning_steps(chain, result["reasoning_chain"]) == [
+            *chain,
+            "[3] No calculations needed, proceeding to reasoning",
+        ]
+
 
 class TestCalculatorNode:
     """Tests for calculator_node."""
@@ -323,6 +549,136 @@ class TestAssumptionAnalyzerNode:
 
         assert MissingInfoType.DESIGNATED_LAND.value in result["missing_info"]
 
+    @pytest.mark.asyncio
+    async def test_question_records_match_schema(
+        self, sample_retrieved_rule_50_percent, sample_drawing_context_no_original
+    ):
+        """Question dicts built directly should match the Pydantic schema."""
+        from app.agent.nodes.assumption_analyzer import assumption_analyzer_node
+        from app.agent.state import ClarificationQuestion
+
+        state: AgentState = {
+            "session_id": "test",
+            "query_type": QueryType.COMPLIANCE_CHECK.value,
+            "drawing_context": sample_drawing_context_no_original.model_dump(),
+            "retrieved_rules": [sample_retrieved_rule_50_percent],
+            "assumptions": [],
+            "missing_info": [],
+            "clarification_questions": [],
+            "caveats": [],
+            "reasoning_chain": [],
+        }
+
+        result = await assumption_analyzer_node(state)
+
+        assert result["clarification_questions"]
+        for question in result["clarification_questions"]:
+            assert ClarificationQuestion.model_validate(question).model_dump() == question
+
+    @pytest.mark.asyncio
+    async def test_assumption_records_match_schema(
+        self,
+        sample_retrieved_rule_50_percent,
+        sample_retrieved_rule_designated,
+        sample_drawing_context_no_original,
+    ):
+        """Assumption dicts built directly should match the Pydantic schema."""
+        from app.agent.nodes.assumption_analyzer import assumption_analyzer_node
+        from app.agent.state import Assumption
+
+        state: AgentState = {
+            "session_id": "test",
+            "query_type": QueryType.LEGAL_SEARCH.value,
+            "drawing_context": sample_drawing_context_no_original.model_dump(),
+            "retrieved_rules": [
+                sample_retrieved_rule_50_percent,
+                sample_retrieved_rule_designated,
+            ],
+            "assumptions": [],
+            "missing_info": [],
+            "clarification_questions": [],
+            "caveats": [],
+            "reasoning_chain": [],
+        }
+
+        result = await assumption_analyzer_node(state)
+
+        assert result["assumptions"]
+        for assumption in result["assumptions"]:
+            assert Assumption.model_validate(assumption).model_dump() == assumption
+
+    @pytest.mark.asyncio
+    async def test_returns_only_new_entries(
+        self, sample_retrieved_rule_50_percent, sample_drawing_context_no_original
+    ):
+        """Existing entries should be left for the channel reducers to keep."""
+        from app.agent.nodes.assumption_analyzer import assumption_analyzer_node
+
+        existing_question = {"id": "missing_drawing", "question": "Upload a drawing?"}
+        state: AgentState = {
+            "session_id": "test",
+            "query_type": QueryType.COMPLIANCE_CHECK.value,
+            "drawing_context": sample_drawing_context_no_original.model_dump(),
+            "retrieved_rules": [sample_retrieved_rule_50_percent],
+            "assumptions": [],
+            "missing_info": [MissingInfoType.DRAWING.value],
+            "clarification_questions": [existing_question],
+            "caveats": [],
+            "reasoning_chain": [],
+        }
+
+        result = await assumption_analyzer_node(state)
+
+        assert MissingInfoType.DRAWING.value not in result["missing_info"]
+        assert MissingInfoType.ORIGINAL_HOUSE.value in result["missing_info"]
+        assert existing_question not in result["clarification_questions"]
+
+    @pytest.mark.asyncio
+    async def test_skips_analysis_when_all_fields_recorded(
+        self, sample_retrieved_rule_50_percent, sample_drawing_context
+    ):
+        """Should skip rule scanning once every field is provided and recorded."""
+        from app.agent.nodes.assumption_analyzer import (
+            _ALL_SPEC_FIELDS,
+            assumption_analyzer_node,
+        )
+
+        drawing_context = sample_drawing_context.model_dump()
+        drawing_context.update(prior_extensions_sqm=0.0, article_4_direction=False)
+        state: AgentState = {
+            "session_id": "test",
+            "query_type": QueryType.COMPLIANCE_CHECK.value,
+            "drawing_context": drawing_context,
+            "retrieved_rules": [sample_retrieved_rule_50_percent],
+            "assumptions": [{"field_name": f} for f in _ALL_SPEC_FIELDS],
+            "missing_info": [],
+            "clarification_questions": [],
+            "caveats": [],
+            "reasoning_chain": [],
+        }
+
+        result = await assumption_analyzer_node(state)
+
+        assert set(result) == {"reasoning_chain"}
+        assert "skipping analysis" in result["reasoning_chain"][-1]
+
+    def test_finds_every_definition_in_one_scan(self):
+        """Keyword matcher should report all definitions, including overlaps."""
+        from app.agent.nodes.assumption_analyzer import _find_definitions
+
+        text = (
+            "an end of terrace house on article 2(3) land, measured from the "
+            "original dwellinghouse, where an article 4 direction applies"
+        )
+
+        assert _find_definitions(text) == {
+            "house_type",
+            "designated_land",
+            "original_dwellinghouse",
+            "article_4",
+        }
+        assert _find_definitions("a single storey rear extension") == set()
+
 
 class TestClarifierNode:
     """Tests for clarifier_node."""
@@ -388,6 +744,89 @@ class TestClarifierNode:
         assert "original house" in result["final_answer"].lower()
 
 
+    @pytest.mark.asyncio
+    async def test_streams_message_deltas_to_callback(self):
+        """With on_token, the LLM is streamed and each delta is forwarded."""
+        from app.agent.nodes.clarifier import clarifier_node
+
+        async def fake_stream():
+            for text in ["Is this ", "the original house?"]:
+                chunk = MagicMock()
+                chunk.choices = [MagicMock()]
+                chunk.choices[0].delta.content = text
+                yield chunk
+
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=fake_stream())
+
+        state: AgentState = {
+            "session_id": "test",
+            "user_query": "Is my extension compliant?",
+            "clarification_questions": [
+                {
+                    "id": "clarify_original_house",
+                    "question": "Is this the original house?",
+                    "why_needed": "For 50% calculation",
+                    "field_name": "is_original_house",
+                    "options": None,
+                    "priority": 1,
+                    "answered": False,
+                }
+            ],
+            "reasoning_chain": [],
+        }
+
+        tokens: list[str] = []
+        with patch("app.agent.nodes.clarifier.get_settings") as mock_settings:
+            mock_settings.return_value.agent_clarifier_model = "gpt-4"
+
+            result = await clarifier_node(
+                state, openai_client=mock_client, on_token=tokens.append
+            )
+
+        assert tokens == ["Is this ", "the original house?"]
+        assert result["final_answer"] == "Is this the original house?"
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_reuses_cached_message_for_repeated_prompt(self):
+        """Identical prompts should only reach the LLM once."""
+        from app.agent.nodes.clarifier import clarifier_node
+
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Is this the original house?"
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        def make_state() -> AgentState:
+            return {
+                "session_id": "test",
+                "user_query": "Is my extension compliant?",
+                "clarification_questions": [
+                    {
+                        "id": "clarify_original_house",
+                        "question": "Is this the original house?",
+                        "why_needed": "For 50% calculation",
+                        "field_name": "is_original_house",
+                        "options": None,
+                        "priority": 1,
+                        "answered": False,
+                    }
+                ],
+                "reasoning_chain": [],
+            }
+
+        with patch("app.agent.nodes.clarifier.get_settings") as mock_settings:
+            mock_settings.return_value.agent_clarifier_model = "gpt-4"
+
+            first = await clarifier_node(make_state(), openai_client=mock_client)
+            second = await clarifier_node(make_state(), openai_client=mock_client)
+
+        assert first["final_answer"] == second["final_answer"]
+        assert mock_client.chat.completions.create.await_count == 1
+
+
 class TestResponseFormatterNode:
     """Tests for response_formatter_node."""
 
@@ -510,3 +949,270 @@ class TestClarificationResponseParsing:
         )
 
         assert result.get("prior_extensions_sqm") == 15.0
+
+
+class TestContextLoaderNode:
+    """Tests for loading drawing context from the session."""
+
+    @pytest.mark.asyncio
+    async def test_loads_meta_and_context_in_one_fetch(self, mock_redis_client):
+        """Session meta and drawing context should come from a single MGET."""
+        import json
+
+        from app.agent.nodes.context_loader import context_loader_node
+
+        await mock_redis_client.set(
+            "session:s1:meta", json.dumps({"session_id": "s1", "house_type": "detached"})
+        )
+        await mock_redis_client.set(
+            "session:s1:context",
+            json.dumps({
+                "objects": [{
+                    "type": "POLYLINE", "layer": "Plot", "closed": True,
+                    "points": [[0, 0], [20000, 0], [20000, 10000], [0, 10000]],
+                }],
+                "metadata": {"coordinate_unit": "mm", "layers_present": ["Plot"]},
+            }),
+        )
+        mock_redis_client.get = AsyncMock(side_effect=AssertionError("use mget"))
+
+        state = create_initial_state("s1", "How big is my plot?")
+        result = await context_loader_node(state, redis_client=mock_redis_client)
+
+        ctx = result["drawing_context"]
+        assert ctx["has_drawing"] is True
+        assert ctx["plot_area_sqm"] == 200.0
+        assert ctx["house_type"] == "detached"
+
+    def test_totals_plot_and_building_areas_by_layer(self):
+        """Largest plot ring and summed building rings should be reported."""
+        import math
+
+        from app.agent.nodes.context_loader import _extract_measurements_from_objects
+
+        # Dense ring approximating a circle of radius 10m, in millimetres
+        circle = [
+            (10000 * math.cos(2 * math.pi * i / 720), 10000 * math.sin(2 * math.pi * i / 720))
+            for i in range(720)
+        ]
+        objects = [
+            {"type": "POLYLINE", "closed": True, "layer": "Plot Boundary", "points": circle},
+            {"type": "POLYLINE", "closed": True, "layer": "plot",
+             "points": [(0, 0), (1000, 0), (1000, 1000), (0, 1000)]},
+            {"type": "POLYLINE", "closed": True, "layer": "Walls",
+             "points": [(0, 0), (5000, 0), (5000, 4000), (0, 4000)]},
+            {"type": "POLYLINE", "closed": True, "layer": "house",
+             "points": [(0, 0), (2000, 0), (2000, 3000), (0, 3000), (0, 0)]},
+            {"type": "POLYLINE", "closed": True, "layer": "trees",
+             "points": [(0, 0), (90000, 0), (90000, 90000)]},
+            {"type": "POLYLINE", "closed": False, "layer": "walls",
+             "points": [(0, 0), (9000, 0), (9000, 9000)]},
+        ]
+
+        measurements = _extract_measurements_from_objects(
+            objects, {"coordinate_unit": "mm"}
+        )
+
+        expected_plot = 0.5 * 720 * 10 * 10 * math.sin(2 * math.pi / 720)
+        assert measurements["plot_area_sqm"] == round(expected_plot, 2)
+        assert measurements["building_footprint_sqm"] == 26.0
+
+    def test_measures_rings_mixing_2d_and_3d_points(self):
+        """Vertices with and without a z coordinate should still form a ring."""
+        from app.agent.nodes.context_loader import _extract_measurements_from_objects
+
+        objects = [
+            {"type": "POLYLINE", "closed": True, "layer": "plot",
+             "points": [[0, 0], [10000, 0], [10000, 10000, 0], [0, 10000]]},
+        ]
+
+        measurements = _extract_measurements_from_objects(
+            objects, {"coordinate_unit": "mm"}
+        )
+
+        assert measurements["plot_area_sqm"] == 100.0
+
+    def test_user_metadata_drops_unknown_enum_values(self):
+        """Unrecognised enum values should be dropped rather than break the context."""
+        from app.agent.nodes.context_loader import _parse_user_metadata
+
+        user_data = _parse_user_metadata(
+            {"house_type": "castle", "is_original_house": True},
+            {"designated_land_type": "conservation_area"},
+        )
+
+        assert user_data == {
+            "is_original_house": True,
+            "designated_land_type": "conservation_area",
+        }
+        DrawingContext(session_id="s", **user_data)
+
+    def test_user_metadata_keeps_unknown_answers(self):
+        """None records an "unknown" clarification answer and must be kept."""
+        from app.agent.nodes.context_loader import _parse_user_metadata
+
+        user_data = _parse_user_metadata(
+            {"house_type": None, "designated_land_type": None},
+            {},
+        )
+
+        assert user_data == {"house_type": None, "designated_land_type": None}
+        DrawingContext(session_id="s", **user_data)
+
+    @pytest.mark.asyncio
+    async def test_missing_session_returns_fresh_empty_context(self, mock_redis_client):
+        """Empty contexts should match the model dump and not share mutable fields."""
+        from app.agent.nodes.context_loader import context_loader_node
+
+        state = create_initial_state("missing", "How big is my plot?")
+        first = await context_loader_node(state, redis_client=mock_redis_client)
+        second = await context_loader_node(state, redis_client=mock_redis_client)
+
+        expected = DrawingContext(session_id="missing", has_drawing=False).model_dump()
+        assert first["drawing_context"] == expected
+        assert first["drawing_context"]["layers_present"] is not (
+            second["drawing_context"]["layers_present"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_reuses_measurements_for_unchanged_upload(self, mock_redis_client):
+        """Re-entering the loader for the same context version should not re-measure."""
+        import json
+
+        from app.agent.nodes import context_loader
+
+        await mock_redis_client.set(
+            "session:s2:meta", json.dumps({"session_id": "s2", "context_version": 1})
+        )
+        await mock_redis_client.set(
+            "session:s2:context",
+            json.dumps({
+                "objects": [{
+                    "type": "POLYLINE", "layer": "Plot", "closed": True,
+                    "points": [[0, 0], [10000, 0], [10000, 10000], [0, 10000]],
+                }],
+                "metadata": {"coordinate_unit": "mm"},
+            }),
+        )
+
+        state = create_initial_state("s2", "How big is my plot?")
+        with patch.object(
+            context_loader,
+            "_extract_measurements_from_objects",
+            wraps=context_loader._extract_measurements_from_objects,
+        ) as extract:
+            first = await context_loader.context_loader_node(state, mock_redis_client)
+            second = await context_loader.context_loader_node(state, mock_redis_client)
+
+        assert extract.call_count == 1
+        assert first["drawing_context"]["plot_area_sqm"] == 100.0
+        assert second["drawing_context"] == first["drawing_context"]
+
+
+class TestRetrieverHelpers:
+    """Tests for converting retrieval results and selecting definitions."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_share_one_service(self):
+        """Concurrent first callers should get one fully initialized service."""
+        import asyncio
+
+        from app.services.retrieval import retriever as retrieval
+
+        initialized = []
+
+        class FakeService:
+            def __init__(self, infrastructure):
+                self.ready = False
+
+            async def initialize(self):
+                await asyncio.sleep(0)
+                self.ready = True
+                initialized.append(self)
+
+        with patch.object(retrieval, "_retriever_service", None), \
+                patch.object(retrieval, "RetrieverService", FakeService):
+            services = await asyncio.gather(
+                *(retrieval.get_retriever_service(MagicMock()) for _ in range(5))
+            )
+
+        assert len(initialized) == 1
+        assert all(service is initialized[0] and service.ready for service in services)
+
+    @pytest.mark.asyncio
+    async def test_reuses_retrieval_for_normalized_repeat_query(self):
+        """Queries differing only in case and spacing should retrieve once."""
+        from app.agent.nodes.retriever import retriever_node
+
+        service = MagicMock()
+        service.retrieve = AsyncMock(return_value=MagicMock(enhanced_parents=[]))
+
+        for query in ("Rear extension depth?", "  rear   EXTENSION depth? "):
+            await retriever_node(create_initial_state("s", query), service)
+
+        assert service.retrieve.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retrieval_cache_is_per_service_instance(self):
+        """A new service should not be served another service's results."""
+        import gc
+
+        from app.agent.nodes import retriever
+        from app.agent.nodes.retriever import retriever_node
+
+        first = MagicMock()
+        first.retrieve = AsyncMock(return_value=MagicMock(enhanced_parents=[]))
+        await retriever_node(create_initial_state("s", "Rear extension depth?"), first)
+
+        del first
+        gc.collect()
+        assert len(retriever._retrieval_cache) == 0
+
+        second = MagicMock()
+        second.retrieve = AsyncMock(return_value=MagicMock(enhanced_parents=[]))
+        await retriever_node(create_initial_state("s", "Rear extension depth?"), second)
+
+        assert second.retrieve.await_count == 1
+
+    def test_converted_rule_matches_retrieved_rule_model(self):
+        """Rule dicts built directly should equal a validated RetrievedRule dump."""
+        from app.agent.nodes.retriever import _convert_enhanced_parent_to_rule
+        from app.agent.state import RetrievedRule
+        from app.services.retrieval.xref_resolver import EnhancedParent
+
+        parent = EnhancedParent(
+            id="p1",
+            score=0.82,
+            match_count=2,
+            best_similarity=0.9,
+            parent_data={
+                "text": "Class A.1(f) within a Conservation Area",
+                "page_start": 12,
+                "page_end": 13,
+                "source": "pd_guide.pdf",
+                "content_index": {
+                    "sections_covered": ["A.1(f)", "A.1(g)"],
+                    "definitions_used": ["curtilage"],
+                },
+            },
+            is_xref_parent=True,
+        )
+
+        rule = _convert_enhanced_parent_to_rule(parent, is_exception=True)
+
+        assert rule == RetrievedRule.model_validate(rule).model_dump()
+        assert rule["section"] == "A.1(f)"
+        assert rule["designated_land_specific"] is True
+
+    def test_selects_definitions_named_in_rule_text_or_metadata(self):
+        """Definitions should be picked up from rule text and uses_definitions."""
+        from app.agent.nodes.retriever import get_definitions_for_rules
+
+        rules = [
+            {"text": "Within the CURTILAGE of a dwellinghouse", "uses_definitions": []},
+            {"text": "Not on Article 2(3) land", "uses_definitions": ["Highway"]},
+        ]
+
+        assert set(get_definitions_for_rules(rules)) == {
+            "curtilage", "article 2(3) land", "highway",
+        }
@@ -1,8 +1,10 @@
 """Unit tests for GeometryCalculator."""
 
+import numpy as np
 import pytest
 from shapely.geometry import LineString, Polygon
 
+from app.geometry._kernels import _shoelace_area_loop, _shoelace_area_numpy, shoelace_area
 from app.geometry.calculator import GeometryCalculator
 
 
@@ -43,6 +45,13 @@ class TestPolygonArea:
         result = calculator.calculate_polygon_area([(0, 0), (1, 1)])
         assert result.get("error") is not None
 
+    def test_shoelace_kernel_matches_shapely(self):
+        polygon = Polygon([(0, 0), (12000, 0), (15000, 9000), (4000, 14000), (-2000, 6000)])
+        xy = np.asarray(polygon.exterior.coords, dtype=np.float64)
+
+        for kernel in (shoelace_area, _shoelace_area_loop, _shoelace_area_numpy):
+            assert kernel(xy[:, 0], xy[:, 1]) == pytest.approx(polygon.area)
+
 
 class TestCurtilageCoverage:
     def test_25_percent_coverage(self, calculator, simple_square, plot_boundary):
@@ -0,0 +1,87 @@
+"""Unit tests for the session repository."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from redis.exceptions import WatchError
+
+from app.repositories.session_repository import (
+    UPDATE_META_MAX_ATTEMPTS,
+    SessionRepository,
+)
+
+
+def _mock_redis(pipe: MagicMock) -> MagicMock:
+    """Redis client whose transactional pipeline is the given mock."""
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    return redis
+
+
+def _mock_pipeline(meta: dict | None) -> MagicMock:
+    """Pipeline returning the given metadata from a watched GET."""
+    pipe = MagicMock()
+    pipe.watch = AsyncMock()
+    pipe.get = AsyncMock(return_value=json.dumps(meta) if meta is not None else None)
+    pipe.execute = AsyncMock(return_value=[True])
+    return pipe
+
+
+class TestUpdateMeta:
+    """Test optimistic metadata updates."""
+
+    @pytest.mark.asyncio
+    async def test_returns_false_when_session_missing(self):
+        """A missing session should not be written."""
+        pipe = _mock_pipeline(None)
+        repo = SessionRepository(_mock_redis(pipe), ttl_seconds=3600)
+
+        assert await repo.update_meta("s1", house_type="detached") is False
+        pipe.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_updates_fields_and_keeps_ttl(self):
+        """Updated metadata should be written without resetting the TTL."""
+        pipe = _mock_pipeline({"session_id": "s1", "context_version": 2})
+        repo = SessionRepository(_mock_redis(pipe), ttl_seconds=3600)
+
+        assert await repo.update_meta("s1", house_type="detached") is True
+
+        pipe.watch.assert_awaited_once_with("session:s1:meta")
+        key, payload = pipe.set.call_args.args
+        assert key == "session:s1:meta"
+        assert pipe.set.call_args.kwargs == {"keepttl": True}
+        written = json.loads(payload)
+        assert written["house_type"] == "detached"
+        assert written["context_version"] == 2
+        assert written["updated_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_retries_after_watch_error(self):
+        """A concurrent write should cause one retry, not a lost update."""
+        pipe = _mock_pipeline({"session_id": "s1"})
+        pipe.execute.side_effect = [WatchError(), [True]]
+        repo = SessionRepository(_mock_redis(pipe), ttl_seconds=3600)
+
+        with patch("app.repositories.session_repository.asyncio.sleep", new=AsyncMock()):
+            assert await repo.update_meta("s1", house_type="detached") is True
+
+        assert pipe.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """A key that keeps changing should not be retried forever."""
+        pipe = _mock_pipeline({"session_id": "s1"})
+        pipe.execute.side_effect = WatchError()
+        repo = SessionRepository(_mock_redis(pipe), ttl_seconds=3600)
+
+        with patch(
+            "app.repositories.session_repository.asyncio.sleep", new=AsyncMock()
+        ) as sleep:
+            assert await repo.update_meta("s1", house_type="detached") is False
+
+        assert pipe.execute.await_count == UPDATE_META_MAX_ATTEMPTS
+        assert sleep.await_count == UPDATE_META_MAX_ATTEMPTS - 1